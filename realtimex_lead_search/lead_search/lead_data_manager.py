@@ -2,21 +2,62 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
-import re
 import sqlite3
+import threading
+from dataclasses import fields
 from pathlib import Path
-from typing import List, Optional
-from urllib.parse import urlparse
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from .models import LeadCandidate, PersistenceResult, RunMetadata, ScoredLead
+from .models import (
+    LeadCandidate,
+    PersistenceResult,
+    RunMetadata,
+    ScoredLead,
+    normalize_email,
+    normalize_phone,
+)
+
+_LEAD_FIELDS = tuple(f.name for f in fields(LeadCandidate))
+
+# Bump whenever _migrate gains a table, column, index or backfill; stored in PRAGMA user_version.
+SCHEMA_VERSION = 2
+
+# Databases already migrated in this process; keeps schema checks off the persist path.
+_ENSURED_DBS: Set[str] = set()
+_ENSURE_LOCK = threading.Lock()
+
+
+# One autocommit connection per database, reused across persist() calls to keep
+# the page cache warm; writes are serialized per connection by its lock. The file's
+# (st_dev, st_ino) is kept so a deleted-and-recreated database gets a fresh connection.
+_CONN_POOL: Dict[str, Tuple[sqlite3.Connection, threading.Lock, Tuple[int, int]]] = {}
+_POOL_LOCK = threading.Lock()
 
 
 def ensure_db(db_path: str) -> None:
-    """Create SQLite schema if missing."""
+    """Create SQLite schema if missing (once per database per process)."""
+    db_key = os.path.abspath(db_path)
+    if db_key in _ENSURED_DBS and os.path.exists(db_key):
+        return
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
+    try:
+        # Databases stamped with the current version need no schema checks at all.
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            _migrate(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+    finally:
+        conn.close()
+    with _ENSURE_LOCK:
+        _ENSURED_DBS.add(db_key)
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Create tables, add missing columns and indexes; idempotent for older DBs."""
     cur = conn.cursor()
     cur.execute(
         """
@@ -51,6 +92,8 @@ def ensure_db(db_path: str) -> None:
             website TEXT,
             phone TEXT,
             email TEXT,
+            email_norm TEXT,
+            phone_norm TEXT,
             address TEXT,
             category TEXT,
             contact_name TEXT,
@@ -66,20 +109,70 @@ def ensure_db(db_path: str) -> None:
         """
     )
     conn.commit()
-    _ensure_column(conn, "runs", "run_uuid", "TEXT")
-    _ensure_column(conn, "runs", "search_input_json", "TEXT")
-    _ensure_column(conn, "runs", "search_fingerprint", "TEXT")
-    _ensure_column(conn, "runs", "segments_json", "TEXT")
-    _ensure_column(conn, "leads", "lead_uuid", "TEXT")
-    _ensure_column(conn, "leads", "run_uuid", "TEXT")
-    _ensure_column(conn, "leads", "segment_key", "TEXT")
-    _ensure_column(conn, "leads", "segment_level", "TEXT")
-    _ensure_column(conn, "leads", "unique_key", "TEXT")
-    _ensure_column(conn, "leads", "times_seen", "INTEGER DEFAULT 1")
-    _ensure_column(conn, "leads", "first_seen_run_id", "TEXT")
-    _ensure_column(conn, "leads", "last_seen_run_id", "TEXT")
+    runs_cols = _table_columns(conn, "runs")
+    leads_cols = _table_columns(conn, "leads")
+    _ensure_column(conn, "runs", runs_cols, "run_uuid", "TEXT")
+    _ensure_column(conn, "runs", runs_cols, "search_input_json", "TEXT")
+    _ensure_column(conn, "runs", runs_cols, "search_fingerprint", "TEXT")
+    _ensure_column(conn, "runs", runs_cols, "segments_json", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "lead_uuid", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "run_uuid", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "segment_key", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "segment_level", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "unique_key", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "times_seen", "INTEGER DEFAULT 1")
+    _ensure_column(conn, "leads", leads_cols, "first_seen_run_id", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "last_seen_run_id", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "email_norm", "TEXT")
+    _ensure_column(conn, "leads", leads_cols, "phone_norm", "TEXT")
+    _backfill_contact_norms(conn)
+    _rekey_leads(conn, leads_cols)
     _ensure_unique(conn, "leads", "uq_leads_unique_key", "unique_key")
-    conn.close()
+    _ensure_index(conn, "leads", "ix_leads_email_norm", "email_norm")
+    _ensure_index(conn, "leads", "ix_leads_phone_norm", "phone_norm")
+    _ensure_index(conn, "leads", "ix_leads_website", "website")
+    _ensure_index(conn, "leads", "ix_leads_run_id", "run_id")
+    _ensure_index(conn, "leads", "ix_leads_run_uuid", "run_uuid")
+
+
+_INSERT_RUN_SQL = """
+    INSERT INTO runs (
+        run_uuid, started_at, ended_at, sources_attempted, errors, stats,
+        search_input_json, search_fingerprint, segments_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_LEAD_SQL = """
+    INSERT INTO leads (
+        lead_uuid, run_uuid, run_id, segment_key, segment_level, unique_key,
+        times_seen, first_seen_run_id, last_seen_run_id,
+        company_name, website, phone, email, email_norm, phone_norm, address, category,
+        contact_name, contact_title, confidence, source_url, source,
+        score, rationale, captured_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_LEAD_SQL = _INSERT_LEAD_SQL + """
+    ON CONFLICT(unique_key) DO UPDATE SET
+        times_seen = leads.times_seen + 1,
+        last_seen_run_id = excluded.last_seen_run_id,
+        company_name = COALESCE(excluded.company_name, leads.company_name),
+        website = COALESCE(excluded.website, leads.website),
+        phone = COALESCE(excluded.phone, leads.phone),
+        email = COALESCE(excluded.email, leads.email),
+        email_norm = COALESCE(excluded.email_norm, leads.email_norm),
+        phone_norm = COALESCE(excluded.phone_norm, leads.phone_norm),
+        address = COALESCE(excluded.address, leads.address),
+        category = COALESCE(excluded.category, leads.category),
+        contact_name = COALESCE(excluded.contact_name, leads.contact_name),
+        contact_title = COALESCE(excluded.contact_title, leads.contact_title),
+        confidence = COALESCE(excluded.confidence, leads.confidence),
+        source_url = COALESCE(excluded.source_url, leads.source_url),
+        source = COALESCE(excluded.source, leads.source),
+        score = excluded.score,
+        rationale = excluded.rationale,
+        captured_at = excluded.captured_at
+"""
 
 
 def persist(
@@ -91,138 +184,159 @@ def persist(
 ) -> PersistenceResult:
     """Persist leads and run metadata to SQLite and optional JSON."""
     ensure_db(db_path)
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO runs (
-            run_uuid, started_at, ended_at, sources_attempted, errors, stats,
-            search_input_json, search_fingerprint, segments_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            metadata.run_id,
-            metadata.start_time,
-            metadata.end_time,
-            json.dumps(metadata.sources_attempted),
-            json.dumps(metadata.errors),
-            json.dumps(metadata.stats),
-            metadata.search_input_json,
-            metadata.search_fingerprint,
-            metadata.segments_json,
-        ),
-    )
-    run_id = cur.lastrowid
-
-    saved_rows = 0
-    for scored in leads:
-        lead: LeadCandidate = scored.lead
-        unique_key = _lead_unique_key(lead)
-        lead.unique_key = unique_key
-        if lead.first_seen_run_id is None:
-            lead.first_seen_run_id = metadata.run_id
-        lead.last_seen_run_id = metadata.run_id
-
-        params = (
-            lead.lead_id,
-            metadata.run_id,
-            run_id,
-            lead.segment_key,
-            lead.segment_level,
-            unique_key,
-            lead.times_seen,
-            lead.first_seen_run_id,
-            lead.last_seen_run_id,
-            lead.company_name,
-            lead.website,
-            lead.phone,
-            lead.email,
-            lead.address,
-            lead.category,
-            lead.contact_name,
-            lead.contact_title,
-            lead.confidence,
-            lead.source_url,
-            lead.source,
-            scored.score,
-            scored.rationale,
-            lead.captured_at,
-        )
-
-        if unique_key:
-            cur.execute(
-                """
-                INSERT INTO leads (
-                    lead_uuid, run_uuid, run_id, segment_key, segment_level, unique_key,
-                    times_seen, first_seen_run_id, last_seen_run_id,
-                    company_name, website, phone, email, address, category,
-                    contact_name, contact_title, confidence, source_url, source,
-                    score, rationale, captured_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(unique_key) DO UPDATE SET
-                    times_seen = leads.times_seen + 1,
-                    last_seen_run_id = excluded.last_seen_run_id,
-                    company_name = COALESCE(excluded.company_name, leads.company_name),
-                    website = COALESCE(excluded.website, leads.website),
-                    phone = COALESCE(excluded.phone, leads.phone),
-                    email = COALESCE(excluded.email, leads.email),
-                    address = COALESCE(excluded.address, leads.address),
-                    category = COALESCE(excluded.category, leads.category),
-                    contact_name = COALESCE(excluded.contact_name, leads.contact_name),
-                    contact_title = COALESCE(excluded.contact_title, leads.contact_title),
-                    confidence = COALESCE(excluded.confidence, leads.confidence),
-                    source_url = COALESCE(excluded.source_url, leads.source_url),
-                    source = COALESCE(excluded.source, leads.source),
-                    score = excluded.score,
-                    rationale = excluded.rationale,
-                    captured_at = excluded.captured_at
-                """
-                ,
-                params,
-            )
-        else:
+    conn, conn_lock = _get_conn(db_path)
+    with conn_lock:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
             cur.execute(
-                """
-                INSERT INTO leads (
-                    lead_uuid, run_uuid, run_id, segment_key, segment_level, unique_key,
-                    times_seen, first_seen_run_id, last_seen_run_id,
-                    company_name, website, phone, email, address, category,
-                    contact_name, contact_title, confidence, source_url, source,
-                    score, rationale, captured_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                params,
+                _INSERT_RUN_SQL,
+                (
+                    metadata.run_id,
+                    metadata.start_time,
+                    metadata.end_time,
+                    json.dumps(metadata.sources_attempted),
+                    json.dumps(metadata.errors),
+                    json.dumps(metadata.stats),
+                    metadata.search_input_json,
+                    metadata.search_fingerprint,
+                    metadata.segments_json,
+                ),
             )
-        saved_rows += 1
+            run_id = cur.lastrowid
 
-    conn.commit()
-    conn.close()
+            upsert_rows = []
+            plain_rows = []
+            for scored in leads:
+                lead: LeadCandidate = scored.lead
+                unique_key = _lead_unique_key(lead)
+                lead.unique_key = unique_key
+                if lead.first_seen_run_id is None:
+                    lead.first_seen_run_id = metadata.run_id
+                lead.last_seen_run_id = metadata.run_id
+                email_norm, phone_norm = _normalized_contact(lead.email, lead.phone)
+
+                params = (
+                    lead.lead_id,
+                    metadata.run_id,
+                    run_id,
+                    lead.segment_key,
+                    lead.segment_level,
+                    unique_key,
+                    lead.times_seen,
+                    lead.first_seen_run_id,
+                    lead.last_seen_run_id,
+                    lead.company_name,
+                    lead.website,
+                    lead.phone,
+                    lead.email,
+                    email_norm,
+                    phone_norm,
+                    lead.address,
+                    lead.category,
+                    lead.contact_name,
+                    lead.contact_title,
+                    lead.confidence,
+                    lead.source_url,
+                    lead.source,
+                    scored.score,
+                    scored.rationale,
+                    lead.captured_at,
+                )
+                (upsert_rows if unique_key else plain_rows).append(params)
+
+            # Batch writes in one transaction: one fsync instead of one per lead.
+            if upsert_rows:
+                cur.executemany(_UPSERT_LEAD_SQL, upsert_rows)
+            if plain_rows:
+                cur.executemany(_INSERT_LEAD_SQL, plain_rows)
+            cur.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+    saved_rows = len(upsert_rows) + len(plain_rows)
 
     json_output_path = None
     if json_export:
         json_output_path = json_path or os.path.join(os.path.dirname(db_path), "leads.json")
         Path(json_output_path).parent.mkdir(parents=True, exist_ok=True)
         with open(json_output_path, "w", encoding="utf-8") as f:
-            json.dump([_scored_to_dict(s) for s in leads], f, ensure_ascii=False, indent=2)
+            _write_json_array(f, (_scored_to_dict(s) for s in leads))
 
     return PersistenceResult(saved_rows=saved_rows, db_path=db_path, json_path=json_output_path)
 
 
+def _get_conn(db_path: str) -> Tuple[sqlite3.Connection, threading.Lock]:
+    """Return the pooled connection (and its write lock) for db_path."""
+    db_key = os.path.abspath(db_path)
+    with _POOL_LOCK:
+        entry = _CONN_POOL.get(db_key)
+        if entry is not None and _file_identity(db_key) != entry[2]:
+            # ensure_db recreates a deleted file before we get here, so compare inodes
+            # rather than existence; the old handle would write to the unlinked file.
+            entry[0].close()
+            entry = None
+        if entry is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            entry = _CONN_POOL[db_key] = (conn, threading.Lock(), _file_identity(db_key))
+        return entry[0], entry[1]
+
+
+def _file_identity(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def close_connections() -> None:
+    """Close pooled SQLite connections (also run at interpreter exit)."""
+    with _POOL_LOCK:
+        for conn, *_ in _CONN_POOL.values():
+            conn.close()
+        _CONN_POOL.clear()
+
+
+atexit.register(close_connections)
+
+
+def _write_json_array(f: IO[str], records: Iterable[Dict[str, Any]]) -> None:
+    """Write records as a JSON array one at a time instead of materializing the list."""
+    f.write("[")
+    first = True
+    for record in records:
+        f.write("\n  " if first else ",\n  ")
+        json.dump(record, f, ensure_ascii=False)
+        first = False
+    f.write("\n]" if not first else "]")
+
+
 def _scored_to_dict(scored: ScoredLead):
-    data = scored.lead.__dict__.copy()
+    lead = scored.lead
+    data = {name: getattr(lead, name) for name in _LEAD_FIELDS}
     data["score"] = scored.score
     data["rationale"] = scored.rationale
     return data
 
 
-def _ensure_column(conn: sqlite3.Connection, table: str, column: str, ddl_type: str) -> None:
-    """Add column if missing; safe for older DBs."""
+def _table_columns(conn: sqlite3.Connection, table: str) -> Set[str]:
+    """Column names of a table, read once per migration pass."""
     cur = conn.cursor()
     cur.execute(f"PRAGMA table_info({table})")
-    cols = {row[1] for row in cur.fetchall()}
+    return {row[1] for row in cur.fetchall()}
+
+
+def _ensure_column(
+    conn: sqlite3.Connection, table: str, cols: Set[str], column: str, ddl_type: str
+) -> None:
+    """Add column if missing; safe for older DBs. Keeps the cached column set current."""
     if column not in cols:
-        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}")
         conn.commit()
+        cols.add(column)
 
 
 def _ensure_unique(conn: sqlite3.Connection, table: str, index_name: str, column: str) -> None:
@@ -234,19 +348,93 @@ def _ensure_unique(conn: sqlite3.Connection, table: str, index_name: str, column
         conn.commit()
 
 
+def _ensure_index(conn: sqlite3.Connection, table: str, index_name: str, column: str) -> None:
+    """Create a lookup index for duplicate searches; safe for older DBs."""
+    cur = conn.cursor()
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({column})")
+    conn.commit()
+
+
+def _normalized_contact(email: Optional[str], phone: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (email_norm, phone_norm) used for indexed duplicate lookups."""
+    email_norm = normalize_email(email) if email else None
+    phone_norm = normalize_phone(phone) if phone else None
+    return email_norm or None, phone_norm or None
+
+
+def _backfill_contact_norms(conn: sqlite3.Connection) -> None:
+    """Fill email_norm/phone_norm on rows written before those columns existed."""
+    rows = conn.execute(
+        """
+        SELECT id, email, phone FROM leads
+        WHERE (email_norm IS NULL AND email IS NOT NULL) OR (phone_norm IS NULL AND phone IS NOT NULL)
+        """
+    ).fetchall()
+    if rows:
+        # Normalized in Python so stored values match compute_lead_keys exactly.
+        conn.executemany(
+            "UPDATE leads SET email_norm = COALESCE(email_norm, ?), phone_norm = COALESCE(phone_norm, ?)"
+            " WHERE id = ?",
+            [(*_normalized_contact(email, phone), row_id) for row_id, email, phone in rows],
+        )
+        conn.commit()
+
+
+def _rekey_leads(conn: sqlite3.Connection, cols: Set[str]) -> None:
+    """
+    Rewrite unique_key in the current format (phone digits only, email stripped and lower-cased)
+    so upserts keep matching rows written by older versions. Rows that now share a key are
+    merged into the oldest one: times_seen adds up and last_seen_run_id comes from the newest.
+    """
+    # Very old tables may predate website/source_url; those rows simply have no such key.
+    contact = ", ".join(col if col in cols else "NULL" for col in ("email", "phone", "website", "source_url"))
+    rows = conn.execute(
+        f"SELECT id, unique_key, {contact}, times_seen, last_seen_run_id"
+        " FROM leads WHERE unique_key IS NOT NULL ORDER BY id"
+    ).fetchall()
+    kept: Dict[str, List[Any]] = {}  # new key -> [id, times_seen, last_seen_run_id, changed]
+    merged: List[int] = []
+    cleared: List[int] = []  # rows whose contact fields no longer yield a key
+    for row_id, old_key, email, phone, website, source_url, times_seen, last_seen in rows:
+        key = _lead_unique_key(
+            LeadCandidate(company_name="", email=email, phone=phone, website=website, source_url=source_url)
+        )
+        if key is None:
+            cleared.append(row_id)
+            continue
+        entry = kept.get(key)
+        if entry is None:
+            kept[key] = [row_id, times_seen, last_seen, key != old_key]
+        else:
+            entry[1] = (entry[1] or 1) + (times_seen or 1)
+            entry[2] = last_seen or entry[2]
+            entry[3] = True
+            merged.append(row_id)
+
+    rekeyed = [
+        (key, times_seen, last_seen, row_id)
+        for key, (row_id, times_seen, last_seen, changed) in kept.items()
+        if changed
+    ]
+    if not (merged or cleared or rekeyed):
+        return
+    conn.executemany("DELETE FROM leads WHERE id = ?", [(row_id,) for row_id in merged])
+    # Clear first so a row taking over another row's old key never trips the unique index.
+    conn.executemany(
+        "UPDATE leads SET unique_key = NULL WHERE id = ?",
+        [(row_id,) for row_id in cleared] + [(row[-1],) for row in rekeyed],
+    )
+    conn.executemany(
+        "UPDATE leads SET unique_key = ?, times_seen = ?, last_seen_run_id = ? WHERE id = ?", rekeyed
+    )
+    conn.commit()
+
+
 def _lead_unique_key(lead: LeadCandidate) -> Optional[str]:
     """Generate a normalized uniqueness key for DB upsert."""
-    if lead.email:
-        return f"email:{lead.email.lower()}"
-    if lead.phone:
-        digits = re.sub(r"\\D", "", lead.phone)
-        if digits:
-            return f"phone:{digits}"
-    if lead.website:
-        normalized_site = lead.website.lower().rstrip("/")
-        return f"web:{normalized_site}"
-    if lead.source_url:
-        parsed = urlparse(lead.source_url)
-        path = parsed.path.rstrip("/")
-        return f"src:{parsed.netloc.lower()}{path}"
+    by_kind = {key.split(":", 1)[0]: key for key in lead.lead_keys}
+    for kind in ("email", "phone", "web", "src"):
+        key = by_kind.get(kind)
+        if key and key != "phone:":  # phone without digits is not identifying
+            return key
     return None
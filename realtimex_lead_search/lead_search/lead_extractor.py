@@ -2,14 +2,69 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
 from html import unescape
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from . import llm_adapter
 from .models import LeadCandidate, LLMSettings, ScrapeArtifact
 
+# All patterns are compiled once at import; no regex is built per artifact, line or lead.
+_EMAIL_PATTERN = r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}"
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}")
+# Line breaks as recognised by str.splitlines; phones only span inline whitespace and
+# never end in trailing whitespace, matching the old per-(stripped)-line scan.
+# Whitespace runs are consumed atomically via (?=(?P<ws>...))(?P=ws), so the end-of-line
+# check is linear instead of rescanning the rest of the run at every space. Possessive
+# quantifiers need 3.11 and the third-party regex module is not a dependency; re.ASCII
+# is avoided because \s must keep matching the NBSP separators Maps puts in phones.
+_BREAK_CHARS = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+_INLINE_WS = rf"[^\S{_BREAK_CHARS}]"
+_LINE_BREAK_RE = re.compile(rf"\r\n|[{_BREAK_CHARS}]")
+_CONTACT_PHONE_PATTERN = (
+    rf"(?P<phone>\+?\d(?:[\d().-]|(?=(?P<ws>{_INLINE_WS}+))(?P=ws)(?![{_BREAK_CHARS}]|\Z)){{7,}})"
+)
+# Emails and phones are scanned separately and merged by position: in one alternation a
+# phone run would swallow the leading digits of an email such as 0909123456@gmail.com.
+_EMAIL_SCAN_RE = re.compile(_EMAIL_PATTERN, re.I)
+_CONTACT_PHONE_RE = re.compile(_CONTACT_PHONE_PATTERN)
+# Script/style blocks in one pass; the tag-name boundary keeps e.g. <scripts> or <styled> intact.
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_DIGIT_RE = re.compile(r"\d")
+
+_CLEAN_TABLE: Dict[int, Optional[str]] = {
+    c: (" " if chr(c).isspace() else None) for c in [*range(0x20), 0x7F, *range(0xE000, 0xF900)]
+}
+_CLEAN_TABLE[ord("·")] = " "
+
+# Shorter page text carries no lead worth an LLM round-trip.
+_MIN_LLM_TEXT_CHARS = 40
+
+# Heuristic results keyed by HTML content hash; mirror/paginated pages often repeat verbatim.
+_EXTRACT_CACHE_SIZE = 512
+_EXTRACT_CACHE: "OrderedDict[bytes, Tuple[List[LeadCandidate], str]]" = OrderedDict()
+_EXTRACT_CACHE_LOCK = threading.Lock()
+
+try:  # Optional C-level HTML parsers; regex stripping is the last resort.
+    from selectolax.lexbor import LexborHTMLParser as _LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    _LexborHTMLParser = None
+
+try:
+    import lxml.html as _lxml_html
+except ImportError:  # pragma: no cover - optional dependency
+    _lxml_html = None
+
 
 def extract_leads(
     artifacts: Iterable[ScrapeArtifact],
@@ -23,69 +78,203 @@ def extract_leads(
     """
     leads: List[LeadCandidate] = []
     errors: List[str] = []
+    llm_pending: List[Tuple[ScrapeArtifact, str, List[LeadCandidate]]] = []
+    llm_sent: Set[bytes] = set()
 
-    for art in artifacts:
+    unique_artifacts = _dedupe_artifacts(artifacts)
+    for art in unique_artifacts:
+        json_leads, parsed, text = _extract_artifact(art)
         if art.status != "ok":
             if art.error:
                 errors.append(art.error)
             continue
 
-        json_leads: List[LeadCandidate] = []
-        if art.json_blob is not None:
-            json_leads = _extract_from_json_blob(art.json_blob, art.source)
-            leads.extend(json_leads)
-
-        # Only fall back to HTML heuristics if we did not get structured listings.
-        if not json_leads:
-            html = art.html or ""
-            text = _html_to_text(html)
-            parsed = _heuristic_extract(text, art.source)
-            leads.extend(parsed)
-
-        # Propagate segment metadata when available
-        for lead in leads:
+        # Propagate segment metadata to this artifact's leads only
+        new_leads = json_leads or parsed
+        for lead in new_leads:
             if lead.segment_key is None:
                 lead.segment_key = getattr(art, "segment_key", None)
             if lead.segment_level is None:
                 lead.segment_level = getattr(art, "segment_level", None)
+        leads.extend(new_leads)
+
+        # Page text only exists on the HTML fallback path; structured listings never need the LLM.
+        if use_llm and llm_settings and _worth_llm(text, llm_sent) and not _heuristics_sufficient(
+            parsed, llm_settings
+        ):
+            llm_pending.append((art, text, parsed))
+
+    # One LLM request per batch of artifacts to amortize round-trips and system prompt tokens.
+    if llm_pending and llm_settings:
+        # llm_batch_size <= 0 sends every pending artifact in a single request.
+        batch_size = llm_settings.llm_batch_size if llm_settings.llm_batch_size > 0 else len(llm_pending)
+        batches = [llm_pending[start: start + batch_size] for start in range(0, len(llm_pending), batch_size)]
 
-        if use_llm and llm_settings:
-            llm_leads, llm_err = _llm_extract(text, llm_settings, llm_transport)
-            leads.extend(llm_leads)
+        def run_batch(batch):
+            docs = [(str(i), text) for i, (_, text, _) in enumerate(batch)]
+            return _llm_extract_batch(docs, llm_settings, llm_transport)
+
+        # Requests are I/O-bound, so batches are fanned out on threads; results keep batch order.
+        workers = min(max(1, llm_settings.max_concurrency), len(batches))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                batch_results = list(pool.map(run_batch, batches))
+        else:
+            batch_results = [run_batch(batch) for batch in batches]
+
+        for batch, (results, llm_err) in zip(batches, batch_results):
+            for i, (art, _, art_leads) in enumerate(batch):
+                # Only keep LLM leads that add keys this artifact's own pass did not produce.
+                keys_seen = set().union(*(lead.lead_keys for lead in art_leads))
+                for lead in results.get(str(i), []):
+                    if lead.lead_keys & keys_seen:
+                        continue
+                    keys_seen |= lead.lead_keys
+                    lead.segment_key = lead.segment_key or art.segment_key
+                    lead.segment_level = lead.segment_level or art.segment_level
+                    leads.append(lead)
             if llm_err:
                 errors.append(llm_err)
 
     return leads, errors
 
 
+def _extract_artifact(
+    art: ScrapeArtifact,
+) -> Tuple[List[LeadCandidate], List[LeadCandidate], Optional[str]]:
+    """Parse one artifact; returns (json_leads, heuristic_leads, page_text)."""
+    json_leads: List[LeadCandidate] = []
+    parsed: List[LeadCandidate] = []
+    text: Optional[str] = None
+    if art.status != "ok":
+        return json_leads, parsed, text
+
+    if art.json_blob is not None:
+        json_leads = _extract_from_json_blob(art.json_blob, art.source)
+
+    # Only fall back to HTML heuristics if we did not get structured listings.
+    if not json_leads:
+        # Browser-rendered text is already plain; only raw HTML needs stripping.
+        if art.text is not None:
+            raw, person = art.text, b"text"
+        else:
+            raw, person = art.html or "", b"html"
+        cache_key = hashlib.blake2b(raw.encode("utf-8", "ignore"), digest_size=16, person=person).digest()
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            templates, text = cached
+            parsed = [_fresh_copy(lead, art.source) for lead in templates]
+        else:
+            text = raw if art.text is not None else _html_to_text(raw)
+            parsed = _heuristic_extract(text, art.source)
+            _cache_put(cache_key, [_fresh_copy(lead, None) for lead in parsed], text)
+    return json_leads, parsed, text
+
+
+def _cache_get(key: bytes) -> Optional[Tuple[List[LeadCandidate], str]]:
+    with _EXTRACT_CACHE_LOCK:
+        entry = _EXTRACT_CACHE.get(key)
+        if entry is not None:
+            _EXTRACT_CACHE.move_to_end(key)
+        return entry
+
+
+def _cache_put(key: bytes, templates: List[LeadCandidate], text: str) -> None:
+    with _EXTRACT_CACHE_LOCK:
+        _EXTRACT_CACHE[key] = (templates, text)
+        _EXTRACT_CACHE.move_to_end(key)
+        while len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE:
+            _EXTRACT_CACHE.popitem(last=False)
+
+
+def _fresh_copy(lead: LeadCandidate, source: Optional[str]) -> LeadCandidate:
+    """Copy a lead with a new lead_id/captured_at so cached results are never shared."""
+    values = {
+        f.name: getattr(lead, f.name) for f in fields(lead) if f.name not in {"lead_id", "captured_at"}
+    }
+    values["source"] = source
+    return LeadCandidate(**values)
+
+
+def _worth_llm(text: Optional[str], sent: Set[bytes]) -> bool:
+    """Skip near-empty page text and text already queued for the LLM in this call."""
+    if not text or len(text.strip()) < _MIN_LLM_TEXT_CHARS:
+        return False
+    digest = hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).digest()
+    if digest in sent:
+        return False
+    sent.add(digest)
+    return True
+
+
+def _heuristics_sufficient(leads: List[LeadCandidate], llm_settings: LLMSettings) -> bool:
+    """True when enough confident non-LLM leads were found to skip the LLM call."""
+    threshold = llm_settings.min_heuristic_leads
+    if threshold <= 0:
+        return False
+    strong = sum(1 for lead in leads if (lead.confidence or 0) >= 0.5)
+    return strong >= threshold
+
+
+def _dedupe_artifacts(artifacts: Iterable[ScrapeArtifact]) -> List[ScrapeArtifact]:
+    """Drop repeated artifacts for the same page, keeping first-seen order."""
+    unique: Dict[Any, ScrapeArtifact] = {}
+    for art in artifacts:
+        key = (art.source, art.step_id) if art.step_id else id(art)
+        existing = unique.get(key)
+        # Prefer a successful fetch over an earlier failed attempt for the same page.
+        if existing is None or (existing.status != "ok" and art.status == "ok"):
+            unique[key] = art
+    return list(unique.values())
+
+
 def _heuristic_extract(text: str, source: Optional[str]) -> List[LeadCandidate]:
     """Lightweight regex-based extraction for Maps-like content."""
     leads: List[LeadCandidate] = []
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    email_pattern = re.compile(r"[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}", re.I)
-    phone_pattern = re.compile(r"(\+?\d[\d\s().-]{7,})")
-
-    for line in lines:
-        if len(leads) > 20:  # safeguard per page
-            break
-        emails = email_pattern.findall(line)
-        phones = phone_pattern.findall(line)
-        if not emails and not phones:
+    # Emails need "@" and phones need a digit: scan for what can actually occur.
+    scans = []
+    if "@" in text:
+        scans.append(((0, m) for m in _EMAIL_SCAN_RE.finditer(text)))
+    if _DIGIT_RE.search(text):
+        scans.append(((1, m) for m in _CONTACT_PHONE_RE.finditer(text)))
+    if not scans:
+        return leads
+    line_starts = [0] + [m.end() for m in _LINE_BREAK_RE.finditer(text)]
+    # line index -> [first email, first phone]; dict order keeps lines in text order
+    contacts: Dict[int, List[Optional[str]]] = {}
+
+    # Lazy merge in text order, so the per-page safeguard still stops both scans early.
+    for kind, match in heapq.merge(*scans, key=lambda item: item[1].start()):
+        value = match.group()
+        if kind == 1 and not _is_valid_phone(value):
             continue
+        line_idx = bisect_right(line_starts, match.start()) - 1
+        slot = contacts.get(line_idx)
+        if slot is None:
+            if len(contacts) > 20:  # safeguard per page
+                break
+            slot = contacts[line_idx] = [None, None]
+        if slot[kind] is None:  # first email / first phone per line wins
+            slot[kind] = value
+
+    for line_idx, (email, phone) in contacts.items():
+        start = line_starts[line_idx]
+        end = line_starts[line_idx + 1] if line_idx + 1 < len(line_starts) else len(text)
+        line = text[start:end].strip()
         company = line.split(" - ")[0][:120] if " - " in line else line[:120]
         leads.append(
             LeadCandidate(
                 company_name=_clean_text(company),
-                email=emails[0] if emails else None,
-                phone=phones[0] if phones else None,
+                email=email,
+                phone=phone,
                 source=source,
-                confidence=0.4 + 0.1 * bool(emails),
+                confidence=0.4 + 0.1 * bool(email),
             )
         )
 
     # Fallback: search across full text if line-based parse failed
     if not leads:
-        phones = phone_pattern.findall(text)
+        phones = [ph for ph in _PHONE_RE.findall(text) if _is_valid_phone(ph)]
         for ph in phones[:5]:
             idx = text.find(ph)
             window = text[max(0, idx - 60): idx + 20]
@@ -103,15 +292,31 @@ def _heuristic_extract(text: str, source: Optional[str]) -> List[LeadCandidate]:
     return leads
 
 
-def _llm_extract(
-    text: str, llm_settings: LLMSettings, transport
-) -> Tuple[List[LeadCandidate], Optional[str]]:
-    """Use an LLM to extract structured leads from text."""
+def _is_valid_phone(candidate: str) -> bool:
+    """Reject digit runs that cannot be phone numbers (E.164 allows at most 15 digits)."""
+    # Count digits in place (str.isdecimal == regex \d) instead of building a digits-only copy.
+    return 7 <= sum(map(str.isdecimal, candidate)) <= 15
+
+
+def _llm_extract_batch(
+    docs: List[Tuple[str, str]], llm_settings: LLMSettings, transport
+) -> Tuple[Dict[str, List[LeadCandidate]], Optional[str]]:
+    """Use an LLM to extract structured leads from several texts in one call, keyed by doc id."""
+    budget = max(1, llm_settings.max_input_tokens // max(1, len(docs)))
+    documents = [
+        {"doc_id": doc_id, "text": llm_adapter.truncate_to_tokens(text, budget)} for doc_id, text in docs
+    ]
     try:
         response = llm_adapter.chat_completion(
             messages=[
-                {"role": "system", "content": "Extract lead details as JSON list."},
-                {"role": "user", "content": text[:6000]},
+                {
+                    "role": "system",
+                    "content": (
+                        "Extract lead details for each document. Return a JSON object "
+                        "mapping every doc_id to a JSON list of leads."
+                    ),
+                },
+                {"role": "user", "content": json.dumps(documents, ensure_ascii=False)},
             ],
             settings=llm_settings,
             transport=transport,
@@ -119,39 +324,79 @@ def _llm_extract(
         )
         choices = response.get("choices") or []
         content = choices[0]["message"]["content"] if choices else ""
-        data = json.loads(content) if content else {}
-        items = data if isinstance(data, list) else data.get("leads") or []
-        leads: List[LeadCandidate] = []
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            leads.append(
-                LeadCandidate(
-                    company_name=item.get("company_name") or "Unknown",
-                    website=item.get("website"),
-                    phone=item.get("phone"),
-                    email=item.get("email"),
-                    address=item.get("address"),
-                    category=item.get("category"),
-                    contact_name=item.get("contact_name"),
-                    contact_title=item.get("contact_title"),
-                    confidence=float(item.get("confidence", 0.6)),
-                    source_url=item.get("source_url"),
-                    source=item.get("source"),
-                )
-            )
-        return leads, None
+        data = llm_adapter.parse_json(content) if content else {}
+        # Tolerate the single-document shapes ([...] or {"leads": [...]}) for one-doc batches.
+        if len(docs) == 1 and (isinstance(data, list) or "leads" in data):
+            data = {docs[0][0]: data if isinstance(data, list) else data.get("leads")}
+        # ...and a flat {"leads": [{"doc_id": ..., ...}]} list tagged per document.
+        elif isinstance(data, dict) and isinstance(data.get("leads"), list):
+            grouped: Dict[str, List[Any]] = {}
+            for item in data["leads"]:
+                if isinstance(item, dict):
+                    doc_id = str(item.get("doc_id", item.get("id")))
+                    grouped.setdefault(doc_id, []).append(item)
+            data = grouped
+        results: Dict[str, List[LeadCandidate]] = {}
+        for doc_id, _ in docs:
+            items = data.get(doc_id) if isinstance(data, dict) else None
+            results[doc_id] = _llm_items_to_leads(items if isinstance(items, list) else [])
+        return results, None
     except Exception as exc:  # pragma: no cover - depends on provider
-        return [], str(exc)
+        return {}, str(exc)
+
+
+def _llm_items_to_leads(items: List[Any]) -> List[LeadCandidate]:
+    """Map LLM JSON lead objects onto LeadCandidate."""
+    leads: List[LeadCandidate] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        leads.append(
+            LeadCandidate(
+                company_name=item.get("company_name") or "Unknown",
+                website=item.get("website"),
+                phone=item.get("phone"),
+                email=item.get("email"),
+                address=item.get("address"),
+                category=item.get("category"),
+                contact_name=item.get("contact_name"),
+                contact_title=item.get("contact_title"),
+                confidence=float(item.get("confidence", 0.6)),
+                source_url=item.get("source_url"),
+                source=item.get("source"),
+            )
+        )
+    return leads
 
 
 def _html_to_text(html: str) -> str:
-    """Strip tags and decode entities in a minimal way."""
-    text = re.sub(r"<script.*?</script>", " ", html, flags=re.S | re.I)
-    text = re.sub(r"<style.*?</style>", " ", text, flags=re.S | re.I)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = unescape(text)
-    text = re.sub(r"\s+", " ", text)
+    """Strip tags and decode entities, preferring a real HTML parser when installed."""
+    if not html:
+        return ""
+    if _LexborHTMLParser is not None:
+        tree = _LexborHTMLParser(html)
+        for node in tree.css("script,style"):
+            node.decompose()
+        return _WS_RE.sub(" ", tree.text(separator=" "))
+    if _lxml_html is not None:
+        try:
+            doc = _lxml_html.fromstring(html)
+        except Exception:
+            doc = None
+        if doc is not None:
+            for node in doc.xpath("//script|//style|//comment()"):
+                node.drop_tree()
+            return _WS_RE.sub(" ", " ".join(doc.itertext()))
+    return _regex_html_to_text(html)
+
+
+def _regex_html_to_text(html: str) -> str:
+    """Fallback tag stripper used when no HTML parser is available."""
+    text = _SCRIPT_STYLE_RE.sub(" ", html)
+    text = _TAG_RE.sub(" ", text)
+    if "&" in text:  # entity-free pages (the common case) skip the decoder entirely
+        text = unescape(text)
+    text = _WS_RE.sub(" ", text)
     return text
 
 
@@ -181,12 +426,10 @@ def _extract_from_json_blob(blob: Any, source: Optional[str]) -> List[LeadCandid
         if company.lower() == "sponsored":
             continue
         phone_raw = item.get("phone") or ""
-        phone_match = re.search(r"\+?\d[\d\s().-]{7,}", phone_raw)
+        phone_match = _PHONE_RE.search(phone_raw)
         phone = phone_match.group(0).strip() if phone_match else None
-        if phone:
-            digits = re.sub(r"\D", "", phone)
-            if len(digits) < 7:
-                phone = None
+        if phone and not _is_valid_phone(phone):
+            phone = None
 
         address = _clean_text(item.get("address") or "")
         map_url = item.get("map_url") or item.get("url") or item.get("source_url")
@@ -212,10 +455,8 @@ def _extract_from_json_blob(blob: Any, source: Optional[str]) -> List[LeadCandid
 
 def _clean_text(value: str) -> str:
     """Normalize text by trimming whitespace and removing control glyphs."""
-    text = value or ""
-    text = text.replace("·", " ").strip()
-    text = re.sub(r"\s+", " ", text)
-    # Drop control chars and private-use glyphs (keeps Unicode like Vietnamese accents)
-    text = re.sub(r"[\u0000-\u001f\u007f]", "", text)
-    text = re.sub(r"[\ue000-\uf8ff]", "", text)
+    # One translate pass drops control chars and private-use glyphs (keeps Unicode like
+    # Vietnamese accents) and turns "·" and whitespace controls into spaces.
+    text = (value or "").translate(_CLEAN_TABLE)
+    text = _WS_RE.sub(" ", text)
     return text.strip(" -\t\r\n")
@@ -2,39 +2,65 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .models import LeadCandidate, ScoredLead, SearchFilters
 
+_HAS_EMAIL = 1
+_HAS_PHONE = 2
+_CATEGORY_MATCH = 4
 
-def score_leads(leads: List[LeadCandidate], filters: Optional[SearchFilters] = None) -> List[ScoredLead]:
-    """Simple heuristic scorer."""
-    filters = filters or SearchFilters()
-    scored: List[ScoredLead] = []
 
-    for lead in leads:
+def _score_table(filters: SearchFilters) -> List[Tuple[float, str]]:
+    """Precompute (score, rationale) for every combination of lead signals.
+
+    A lead's score only depends on three booleans once the filters are fixed,
+    so each lead becomes a table lookup instead of a chain of conditionals.
+    """
+    table: List[Tuple[float, str]] = []
+    for mask in range(8):
         score = 0.2  # base
         rationale_parts = []
 
-        if lead.email:
+        if mask & _HAS_EMAIL:
             score += 0.3
             rationale_parts.append("has_email")
-        if lead.phone:
+        if mask & _HAS_PHONE:
             score += 0.2
             rationale_parts.append("has_phone")
-        if lead.category and filters.categories:
-            if lead.category.lower() in [c.lower() for c in filters.categories]:
-                score += 0.2
-                rationale_parts.append("category_match")
-        if filters.must_have_email and not lead.email:
+        if mask & _CATEGORY_MATCH:
+            score += 0.2
+            rationale_parts.append("category_match")
+        if filters.must_have_email and not mask & _HAS_EMAIL:
             score -= 0.3
             rationale_parts.append("missing_required_email")
-        if filters.must_have_phone and not lead.phone:
+        if filters.must_have_phone and not mask & _HAS_PHONE:
             score -= 0.2
             rationale_parts.append("missing_required_phone")
 
         score = max(0.0, min(1.0, score))
         rationale = ", ".join(rationale_parts) if rationale_parts else "baseline"
+        table.append((score, rationale))
+    return table
+
+
+def score_leads(leads: List[LeadCandidate], filters: Optional[SearchFilters] = None) -> List[ScoredLead]:
+    """Simple heuristic scorer."""
+    filters = filters or SearchFilters()
+    table = _score_table(filters)
+    cat_lookup = frozenset(c.lower() for c in filters.categories) if filters.categories else None
+    scored: List[ScoredLead] = []
+
+    for lead in leads:
+        mask = 0
+        if lead.email:
+            mask |= _HAS_EMAIL
+        if lead.phone:
+            mask |= _HAS_PHONE
+        if cat_lookup and lead.category and lead.category.lower() in cat_lookup:
+            mask |= _CATEGORY_MATCH
+
+        score, rationale = table[mask]
         scored.append(ScoredLead(lead=lead, score=score, rationale=rationale))
 
     scored.sort(key=lambda s: s.score, reverse=True)
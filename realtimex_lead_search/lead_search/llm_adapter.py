@@ -2,20 +2,121 @@
 
 from __future__ import annotations
 
+import http.client
+import io
 import json
-from typing import Any, Callable, Dict, List, Optional
-from urllib import request
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib import error, request
+from urllib.parse import urlsplit
 
 from .models import LLMSettings
 
+try:  # Optional exact tokenizer; falls back to a chars-per-token estimate.
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+try:  # Optional faster JSON codec; falls back to the stdlib.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 Transport = Callable[[str, Dict[str, str], bytes], Dict[str, Any]]
 
+# Rough OpenAI-style average used when tiktoken is unavailable.
+_CHARS_PER_TOKEN = 4
 
-def _default_transport(url: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
-    """Minimal HTTP transport using urllib to avoid extra deps."""
+# Process-wide cap on concurrent provider requests, whatever pools callers run.
+_MAX_IN_FLIGHT = 16
+_IN_FLIGHT = threading.BoundedSemaphore(_MAX_IN_FLIGHT)
+
+
+def parse_json(data: Any) -> Any:
+    """Decode JSON from str or UTF-8 bytes (orjson when installed; errors are ValueErrors either way)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+# Per-thread keep-alive connections keyed by (scheme, host:port); http.client
+# connections are not thread-safe, and worker threads are reused by the pools.
+_LOCAL = threading.local()
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def _get_connection(key: Tuple[str, str]) -> http.client.HTTPConnection:
+    conns = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
+    conn = conns.get(key)
+    if conn is None:
+        scheme, netloc = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conns[key] = cls(netloc, timeout=30)
+    return conn
+
+
+def _drop_connection(key: Tuple[str, str]) -> None:
+    conn = getattr(_LOCAL, "conns", {}).pop(key, None)
+    if conn is not None:
+        conn.close()
+
+
+def _urlopen_transport(url: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    """Plain urllib request: honours HTTP(S)_PROXY/NO_PROXY and follows redirects."""
     req = request.Request(url, data=body, headers=headers, method="POST")
-    with request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    # A fresh opener reads proxy settings now, matching _proxied (urlopen caches them on first use).
+    with request.build_opener().open(req, timeout=30) as resp:
+        return parse_json(resp.read())
+
+
+def _proxied(scheme: str, netloc: str) -> bool:
+    """True when the environment (read on every call) routes this origin through a proxy."""
+    return bool(request.getproxies().get(scheme)) and not request.proxy_bypass(netloc)
+
+
+def _default_transport(url: str, headers: Dict[str, str], body: bytes) -> Dict[str, Any]:
+    """Minimal HTTP transport over a reused keep-alive connection; stdlib only to avoid extra deps."""
+    parts = urlsplit(url)
+    if _proxied(parts.scheme, parts.netloc):
+        return _urlopen_transport(url, headers, body)
+    key = (parts.scheme, parts.netloc)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    for attempt in range(2):
+        conn = _get_connection(key)
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE_CONN_ERRORS:
+            # Server closed an idle keep-alive socket; reconnect once.
+            _drop_connection(key)
+            if attempt:
+                raise
+            continue
+        except Exception:
+            _drop_connection(key)
+            raise
+        if resp.will_close:
+            _drop_connection(key)
+        if 300 <= resp.status < 400:
+            # Rare (moved base_url); let urllib apply its redirect rules.
+            return _urlopen_transport(url, headers, body)
+        if resp.status >= 400:
+            raise error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(data))
+        return parse_json(data)
+    raise AssertionError("unreachable")  # pragma: no cover
 
 
 def chat_completion(
@@ -51,6 +152,36 @@ def chat_completion(
     if settings.api_key:
         headers["Authorization"] = f"Bearer {settings.api_key}"
 
-    body = json.dumps(payload).encode("utf-8")
+    body = _dump_json(payload)
     runner = transport or _default_transport
-    return runner(url, headers, body)
+    with _IN_FLIGHT:
+        return runner(url, headers, body)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """Load the tokenizer once; None if tiktoken or its data is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # pragma: no cover - offline/no cached encoding data
+        return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim text to roughly max_tokens prompt tokens.
+    Repeated lines (nav/footer boilerplate) are dropped first so the budget carries signal.
+    """
+    lines = [ln.strip() for ln in (text or "").splitlines()]
+    text = "\n".join(dict.fromkeys(ln for ln in lines if ln))
+    if max_tokens <= 0:
+        return ""
+    enc = _encoding()
+    if enc is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+import re
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
+from urllib.parse import urlparse
 from uuid import uuid4
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+_NON_DIGIT_RE = re.compile(r"\D")
 
 
 def _ts() -> str:
@@ -13,6 +19,22 @@ def _ts() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+# Leads and artifacts are built in bursts; a ~100ms-old stamp is fine for them.
+_TS_TTL = 0.1
+_TS_CACHE: Tuple[float, str] = (0.0, "")
+
+
+def _ts_cached() -> str:
+    """ISO timestamp reused for _TS_TTL seconds (default factory for bulk-built records)."""
+    global _TS_CACHE
+    now = time.time()
+    stamp_at, stamp = _TS_CACHE
+    if not 0.0 <= now - stamp_at < _TS_TTL:
+        stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _TS_CACHE = (now, stamp)
+    return stamp
+
+
 def _uuid() -> str:
     """UUIDv4 string (hyphenated)."""
     return str(uuid4())
@@ -27,6 +49,15 @@ class LLMSettings:
     temperature: float = 0.0
     top_p: float = 1.0
     max_tokens: Optional[int] = None
+    # Prompt budget for page text sent to LLM extraction.
+    max_input_tokens: int = 1500
+    # Artifacts combined into a single LLM extraction request (<= 0: all in one).
+    llm_batch_size: int = 4
+    # Batched extraction requests allowed in flight at once for one run.
+    max_concurrency: int = 4
+    # Skip LLM extraction for an artifact once heuristics found this many leads
+    # with confidence >= 0.5; 0 always calls the LLM.
+    min_heuristic_leads: int = 3
 
 
 @dataclass
@@ -86,6 +117,10 @@ class SearchRequest:
             temperature=float(llm_payload.get("temperature", 0.0)),
             top_p=float(llm_payload.get("top_p", 1.0)),
             max_tokens=llm_payload.get("max_tokens"),
+            max_input_tokens=int(llm_payload.get("max_input_tokens", 1500)),
+            llm_batch_size=int(llm_payload.get("llm_batch_size", 4)),
+            max_concurrency=int(llm_payload.get("max_concurrency", 4)),
+            min_heuristic_leads=int(llm_payload.get("min_heuristic_leads", 3)),
         )
         storage = payload.get("storage") or {"sqlite_path": "./data/lead_search.db", "json_export": False}
         features = payload.get("features") or {"anti_detection": True, "capture_screenshots": False}
@@ -106,7 +141,7 @@ class SearchRequest:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class StrategyStep:
     source: str
     query: str
@@ -129,11 +164,18 @@ class ScrapeArtifact:
     error: Optional[str] = None
     segment_key: Optional[str] = None
     segment_level: Optional[str] = None
-    fetched_at: str = field(default_factory=_ts)
+    text: Optional[str] = None  # rendered page text; when set, extraction skips HTML stripping
+    fetched_at: str = field(default_factory=_ts_cached)
 
 
-@dataclass
-class LeadCandidate:
+class _LeadKeyCache:
+    """Slot storage for LeadCandidate's derived keys, kept out of the dataclass fields."""
+
+    __slots__ = ("_keys", "_keys_source")
+
+
+@dataclass(slots=True)
+class LeadCandidate(_LeadKeyCache):
     company_name: str
     website: Optional[str] = None
     phone: Optional[str] = None
@@ -145,7 +187,7 @@ class LeadCandidate:
     confidence: float = 0.0
     source_url: Optional[str] = None
     source: Optional[str] = None
-    captured_at: str = field(default_factory=_ts)
+    captured_at: str = field(default_factory=_ts_cached)
     segment_key: Optional[str] = None
     segment_level: Optional[str] = None
     unique_key: Optional[str] = None
@@ -154,6 +196,60 @@ class LeadCandidate:
     last_seen_run_id: Optional[str] = None
     lead_id: str = field(default_factory=_uuid)
 
+    def __post_init__(self) -> None:
+        self._keys_source = self._key_inputs()
+        self._keys = compute_lead_keys(self)
+
+    @property
+    def lead_keys(self) -> FrozenSet[str]:
+        """Normalized dedupe keys (email/phone/website/source), computed once at construction."""
+        key_inputs = self._key_inputs()
+        if key_inputs != self._keys_source:  # contact fields were reassigned
+            self._keys_source = key_inputs
+            self._keys = compute_lead_keys(self)
+        return self._keys
+
+    def _key_inputs(self) -> Tuple[Optional[str], ...]:
+        return (self.email, self.phone, self.website, self.source_url)
+
+
+def compute_lead_keys(lead: LeadCandidate) -> FrozenSet[str]:
+    """Build the set of normalized keys used for dedupe and DB uniqueness."""
+    keys = []
+    if lead.email:
+        keys.append(f"email:{normalize_email(lead.email)}")
+    if lead.phone:
+        keys.append(f"phone:{normalize_phone(lead.phone)}")
+    if lead.website:
+        keys.append(_norm_website(lead.website))
+    if lead.source_url:
+        keys.append(_norm_source_url(lead.source_url))
+    return frozenset(keys)
+
+
+def normalize_email(email: str) -> str:
+    """Email as used in dedupe keys and the indexed email_norm column."""
+    return email.strip().lower()
+
+
+def normalize_phone(phone: str) -> str:
+    """Phone digits as used in dedupe keys and the indexed phone_norm column."""
+    return _NON_DIGIT_RE.sub("", phone)
+
+
+@lru_cache(maxsize=4096)
+def _norm_website(website: str) -> str:
+    """Normalized website key; cached since batches repeat the same sites."""
+    return f"web:{website.lower().rstrip('/')}"
+
+
+@lru_cache(maxsize=4096)
+def _norm_source_url(url: str) -> str:
+    """Normalized source key; cached to avoid re-parsing clustered Maps URLs."""
+    parsed = urlparse(url)
+    # Deduplicate on host + path to catch repeated Maps place links
+    return f"src:{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
 
 @dataclass
 class ScoredLead:
@@ -199,14 +295,21 @@ class LeadSearchResponse:
     passthrough: Dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
-        def encode(obj: Any) -> Any:
-            if isinstance(obj, list):
-                return [encode(x) for x in obj]
-            if dataclass_isinstance(obj):
-                return {k: encode(v) for k, v in asdict(obj).items()}
-            return obj
-
-        return encode(self)
+        return _encode(self)
+
+
+def _encode(obj: Any) -> Any:
+    """Single-pass replacement for asdict(): no intermediate deep copy, then re-walk."""
+    if dataclass_isinstance(obj):
+        # getattr rather than __dict__: LeadCandidate uses __slots__.
+        return {k: _encode(getattr(obj, k)) for k in obj.__dataclass_fields__}
+    if isinstance(obj, list):
+        return [_encode(x) for x in obj]
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return tuple(_encode(x) for x in obj)
+    return obj
 
 
 def dataclass_isinstance(obj: Any) -> bool:
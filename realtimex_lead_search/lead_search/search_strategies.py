@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from .models import SearchRequest, StrategyStep
 
@@ -26,14 +27,24 @@ def build_strategies(request: SearchRequest) -> List[StrategyStep]:
 
 def build_google_maps_strategies(request: SearchRequest) -> List[StrategyStep]:
     """Create strategy steps for Google Maps search."""
-    steps: List[StrategyStep] = []
     if not request.keywords:
-        return steps
+        return []
+    return list(
+        _google_maps_steps(
+            tuple(request.keywords),
+            tuple(request.locations or [None]),
+            max(1, request.pages_per_source),
+        )
+    )
 
-    locations = request.locations or [None]
-    max_pages = max(1, request.pages_per_source)
 
-    for kw in request.keywords:
+@lru_cache(maxsize=128)
+def _google_maps_steps(
+    keywords: Tuple[str, ...], locations: Tuple[Optional[str], ...], max_pages: int
+) -> Tuple[StrategyStep, ...]:
+    """Build steps once per input; StrategyStep is frozen, so cached instances are shared safely."""
+    steps: List[StrategyStep] = []
+    for kw in keywords:
         for loc in locations:
             query = kw if not loc else f"{kw} {loc}"
             for page in range(1, max_pages + 1):
@@ -50,4 +61,4 @@ def build_google_maps_strategies(request: SearchRequest) -> List[StrategyStep]:
                         step_id=seg_key,
                     )
                 )
-    return steps
+    return tuple(steps)
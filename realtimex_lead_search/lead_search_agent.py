@@ -11,7 +11,7 @@ import json
 import sys
 from datetime import datetime
 import hashlib
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from .lead_search import (
     anti_detection,
@@ -24,6 +24,16 @@ from .lead_search import (
 )
 from .lead_search.models import LeadSearchResponse, RunMetadata, SearchRequest
 
+try:  # Optional faster JSON codec for payload and response.
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Feature keys that tune how a search executes rather than what it looks for; they are left out
+# of the search fingerprint so the same search matches across runs with different worker counts.
+# extract_workers is no longer read but may still appear in saved payloads.
+_EXECUTION_FEATURES = frozenset({"scrape_workers", "extract_workers"})
+
 
 def now_iso() -> str:
     return datetime.utcnow().isoformat() + "Z"
@@ -31,19 +41,29 @@ def now_iso() -> str:
 
 def load_payload(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
     """Load payload from stdin (if piped) or from --payload file."""
+    # Parse raw bytes in one call (orjson when available) instead of decoding a text stream.
     if not sys.stdin.isatty():
         try:
-            return json.load(sys.stdin)
+            data = sys.stdin.buffer.read()
+            if data:
+                return _loads(data)
         except Exception:
             pass
 
     if args.payload:
-        with open(args.payload, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(args.payload, "rb") as f:
+            return _loads(f.read())
     return None
 
 
-def main(argv: Optional[list[str]] = None):
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def main(argv: Optional[list[str]] = None, browser_factory: Optional[Callable[[], Any]] = None):
+    """Run one search; live steps need browser_factory, otherwise only preloaded data is used."""
     parser = argparse.ArgumentParser(description="RealtimeX lead search agent")
     parser.add_argument("--payload", help="Path to JSON payload (if not piping stdin)")
     parser.add_argument("--use-llm", action="store_true", help="Enable LLM extraction in addition to heuristics")
@@ -65,6 +85,8 @@ def main(argv: Optional[list[str]] = None):
     metadata.sources_attempted = request.sources
     search_input = _normalize_search_input(request)
     metadata.search_input_json = json.dumps(search_input, ensure_ascii=False, sort_keys=True)
+    # Kept on SHA-256: fingerprints are persisted in runs.search_fingerprint and matched across
+    # runs, and for a sub-KB input the OpenSSL-backed digest costs well under a microsecond.
     metadata.search_fingerprint = hashlib.sha256(metadata.search_input_json.encode("utf-8")).hexdigest()
 
     steps = search_strategies.build_strategies(request)
@@ -78,9 +100,10 @@ def main(argv: Optional[list[str]] = None):
         steps,
         anti_detection_config=anti_cfg,
         capture_screenshots=bool(request.features.get("capture_screenshots", False)),
-        browser_factory=None,  # inject Playwright browser from caller if desired
+        browser_factory=browser_factory,
         preloaded_html=preloaded_html,
         preloaded_json=preloaded_json,
+        max_parallel=int(request.features.get("scrape_workers", 1)),
     )
     logs.append(
         f"event=scrape.completed artifacts={len(artifacts)} "
@@ -89,7 +112,9 @@ def main(argv: Optional[list[str]] = None):
 
     use_llm = args.use_llm or bool(payload.get("use_llm_extraction", False))
     leads, extract_errors = lead_extractor.extract_leads(
-        artifacts, llm_settings=request.llm if use_llm else None, use_llm=use_llm
+        artifacts,
+        llm_settings=request.llm if use_llm else None,
+        use_llm=use_llm,
     )
     logs.append(f"event=extract.completed leads_raw={len(leads)} errors={len(extract_errors)} llm={use_llm}")
 
@@ -135,7 +160,23 @@ def main(argv: Optional[list[str]] = None):
         passthrough=request.passthrough,
     )
 
-    print(json.dumps(response.to_dict(), ensure_ascii=False, indent=2))
+    _write_json(response.to_dict())
+
+
+def _write_json(data: Dict[str, Any]) -> None:
+    """Write the response to stdout as indented UTF-8 JSON, encoded straight to bytes when possible."""
+    if orjson is not None:
+        encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        encoded = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(encoded.decode("utf-8") + "\n")
+        return
+    sys.stdout.flush()
+    out.write(encoded)
+    out.write(b"\n")
+    out.flush()
 
 
 def _normalize_search_input(request: SearchRequest) -> Dict[str, Any]:
@@ -151,7 +192,7 @@ def _normalize_search_input(request: SearchRequest) -> Dict[str, Any]:
             "must_have_phone": request.filters.must_have_phone,
             "custom": request.filters.custom,
         },
-        "features": request.features,
+        "features": {k: v for k, v in request.features.items() if k not in _EXECUTION_FEATURES},
     }
 
 
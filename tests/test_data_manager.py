@@ -1,7 +1,10 @@
 import json
 import os
+import sqlite3
 from pathlib import Path
 
+import pytest
+
 from realtimex_lead_search.lead_search import lead_data_manager
 from realtimex_lead_search.lead_search.models import LeadCandidate, RunMetadata, ScoredLead
 
@@ -24,3 +27,180 @@ def test_persist_creates_db_and_json(tmp_path: Path):
 
     data = json.loads(json_path.read_text())
     assert data[0]["company_name"] == "Test Co"
+
+
+def test_persist_upserts_duplicate_keys_in_one_batch(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    metadata = RunMetadata()
+    scored = [
+        ScoredLead(lead=LeadCandidate(company_name="A", email="dup@test.com"), score=0.5),
+        ScoredLead(lead=LeadCandidate(company_name="B", email="dup@test.com"), score=0.6),
+        ScoredLead(lead=LeadCandidate(company_name="No Key"), score=0.1),
+    ]
+
+    result = lead_data_manager.persist(scored, metadata, db_path=str(db_path))
+
+    assert result.saved_rows == 3
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT company_name, times_seen FROM leads ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [("B", 2), ("No Key", 1)]
+
+
+def test_lead_unique_key_normalizes_phone_digits():
+    lead = LeadCandidate(company_name="Phone Only", phone="+1 (206) 555-1234")
+    assert lead_data_manager._lead_unique_key(lead) == "phone:12065551234"
+
+
+def test_migration_backfills_contact_norms_for_existing_rows(tmp_path: Path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE leads (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER, company_name TEXT,"
+        " website TEXT, phone TEXT, email TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO leads (company_name, phone, email) VALUES ('Old Co', '+1 (206) 555-1234', ' Old@Test.com ')"
+    )
+    conn.commit()
+    conn.close()
+
+    lead_data_manager.ensure_db(str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    row = conn.execute("SELECT email_norm, phone_norm FROM leads").fetchone()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert row == ("old@test.com", "12065551234")
+    assert version == lead_data_manager.SCHEMA_VERSION
+
+
+def test_migration_rekeys_old_unique_keys_so_upserts_match(tmp_path: Path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    lead_data_manager._migrate(conn)
+    # Keys as version 1 wrote them: phone kept verbatim, email lower-cased but not stripped.
+    conn.executemany(
+        "INSERT INTO leads (unique_key, times_seen, last_seen_run_id, company_name, phone, email)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("phone:+1 (206) 555-1234", 1, "run-1", "Phone Co", "+1 (206) 555-1234", None),
+            ("email: old@test.com ", 2, "run-1", "Mail Co", None, " Old@Test.com "),
+            ("email:old@test.com", 1, "run-2", "Mail Co", None, "old@test.com"),
+        ],
+    )
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    metadata = RunMetadata()
+    scored = [
+        ScoredLead(lead=LeadCandidate(company_name="Phone Co", phone="+1 206 555 1234"), score=0.5),
+        ScoredLead(lead=LeadCandidate(company_name="Mail Co", email="OLD@test.com"), score=0.5),
+    ]
+    lead_data_manager.persist(scored, metadata, db_path=str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT unique_key, times_seen FROM leads ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [("phone:12065551234", 2), ("email:old@test.com", 4)]
+
+
+def test_email_norm_matches_unique_key(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    lead = LeadCandidate(company_name="Spaced", email=" Mixed@Test.com ")
+    lead_data_manager.persist([ScoredLead(lead=lead, score=0.5)], RunMetadata(), db_path=str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    unique_key, email_norm = conn.execute("SELECT unique_key, email_norm FROM leads").fetchone()
+    conn.close()
+    assert unique_key == f"email:{email_norm}" == "email:mixed@test.com"
+
+
+def _persist_names(db_path: Path, *names: str):
+    scored = [ScoredLead(lead=LeadCandidate(company_name=name), score=0.1) for name in names]
+    return lead_data_manager.persist(scored, RunMetadata(), db_path=str(db_path))
+
+
+def _lead_rows(db_path: Path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT company_name FROM leads ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_persist_reuses_pooled_connection(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    db_key = os.path.abspath(db_path)
+
+    _persist_names(db_path, "A")
+    conn = lead_data_manager._CONN_POOL[db_key][0]
+    _persist_names(db_path, "B")
+
+    assert lead_data_manager._CONN_POOL[db_key][0] is conn
+    assert _lead_rows(db_path) == [("A",), ("B",)]
+
+
+def test_persist_reconnects_after_db_file_is_deleted(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    db_key = os.path.abspath(db_path)
+    _persist_names(db_path, "A")
+    stale = lead_data_manager._CONN_POOL[db_key][0]
+
+    for path in tmp_path.glob("lead_search.db*"):
+        path.unlink()
+    _persist_names(db_path, "B")
+
+    assert lead_data_manager._CONN_POOL[db_key][0] is not stale
+    assert _lead_rows(db_path) == [("B",)]
+
+
+def test_persist_rolls_back_the_whole_run_on_error(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    bad = ScoredLead(lead=LeadCandidate(company_name="Bad"), score=object())  # not bindable
+
+    with pytest.raises(sqlite3.Error):
+        lead_data_manager.persist([bad], RunMetadata(), str(db_path))
+
+    conn = lead_data_manager._CONN_POOL[os.path.abspath(db_path)][0]
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+    _persist_names(db_path, "Good")
+    assert _lead_rows(db_path) == [("Good",)]
+
+
+def test_close_connections_empties_the_pool(tmp_path: Path):
+    db_path = tmp_path / "lead_search.db"
+    _persist_names(db_path, "A")
+    conn = lead_data_manager._CONN_POOL[os.path.abspath(db_path)][0]
+
+    lead_data_manager.close_connections()
+
+    assert lead_data_manager._CONN_POOL == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+def test_ensure_db_skips_migration_at_current_schema_version(tmp_path: Path, monkeypatch):
+    db_path = tmp_path / "lead_search.db"
+    db_key = os.path.abspath(db_path)
+    lead_data_manager.ensure_db(str(db_path))
+    lead_data_manager._ENSURED_DBS.discard(db_key)
+
+    migrations = []
+    monkeypatch.setattr(lead_data_manager, "_migrate", migrations.append)
+    lead_data_manager.ensure_db(str(db_path))
+    assert migrations == []
+
+    # An older stamp runs the migration again and is bumped to the current version.
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"PRAGMA user_version = {lead_data_manager.SCHEMA_VERSION - 1}")
+    conn.close()
+    lead_data_manager._ENSURED_DBS.discard(db_key)
+    lead_data_manager.ensure_db(str(db_path))
+
+    conn = sqlite3.connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert len(migrations) == 1
+    assert version == lead_data_manager.SCHEMA_VERSION
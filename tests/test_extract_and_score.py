@@ -1,5 +1,11 @@
+import json
+
+import pytest
+
 from realtimex_lead_search.lead_search import lead_cache_manager, lead_extractor, lead_scorer
-from realtimex_lead_search.lead_search.models import ScrapeArtifact, SearchFilters
+from realtimex_lead_search.lead_search.models import LeadCandidate, LLMSettings, ScrapeArtifact, SearchFilters
+
+PAGE_FILLER = "Open 24 hours. Family owned and serving the greater Seattle area."
 
 
 def test_extract_and_score_heuristics():
@@ -22,3 +28,219 @@ def test_extract_and_score_heuristics():
     filters = SearchFilters(categories=["plumbing"], must_have_phone=True)
     scored = lead_scorer.score_leads(deduped, filters)
     assert scored[0].score >= 0.6
+
+
+@pytest.mark.parametrize(
+    "has_email,has_phone,in_category,plain,required",
+    [
+        (False, False, False, (0.2, "baseline"), (0.0, "missing_required_email, missing_required_phone")),
+        (True, False, False, (0.5, "has_email"), (0.3, "has_email, missing_required_phone")),
+        (False, True, False, (0.4, "has_phone"), (0.1, "has_phone, missing_required_email")),
+        (True, True, False, (0.7, "has_email, has_phone"), (0.7, "has_email, has_phone")),
+        (
+            False,
+            False,
+            True,
+            (0.4, "category_match"),
+            (0.0, "category_match, missing_required_email, missing_required_phone"),
+        ),
+        (True, False, True, (0.7, "has_email, category_match"), (0.5, "has_email, category_match, missing_required_phone")),
+        (False, True, True, (0.6, "has_phone, category_match"), (0.3, "has_phone, category_match, missing_required_email")),
+        (True, True, True, (0.9, "has_email, has_phone, category_match"), (0.9, "has_email, has_phone, category_match")),
+    ],
+)
+def test_score_leads_covers_every_signal_combination(has_email, has_phone, in_category, plain, required):
+    lead = LeadCandidate(
+        company_name="Shop",
+        email="shop@example.com" if has_email else None,
+        phone="+1 206 555 1234" if has_phone else None,
+        category="Plumbing" if in_category else "Bakery",
+    )
+
+    for filters, (score, rationale) in (
+        (SearchFilters(categories=["plumbing"]), plain),
+        (SearchFilters(categories=["plumbing"], must_have_email=True, must_have_phone=True), required),
+    ):
+        [scored] = lead_scorer.score_leads([lead], filters)
+        assert scored.score == pytest.approx(score)
+        assert scored.rationale == rationale
+
+
+def test_heuristic_phone_scan_is_linear_on_long_whitespace_runs():
+    # Each space once rescanned the rest of its run; 50k spaces would take minutes.
+    text = "Shop 1" + " " * 50_000 + "\nBest Plumbing - +1 206 555 1234   \n"
+    leads = lead_extractor._heuristic_extract(text, "google_maps")
+    assert [lead.phone for lead in leads] == ["+1 206 555 1234"]
+
+
+def test_heuristic_scan_without_at_sign_uses_phone_only_pattern(monkeypatch):
+    class NoEmailScan:
+        def finditer(self, text):
+            raise AssertionError("text without '@' should not try the email alternative")
+
+    monkeypatch.setattr(lead_extractor, "_EMAIL_SCAN_RE", NoEmailScan())
+    text = "Best Plumbing - 4.7(123) · Plumber · +1 206 555 1234\nOpen 24 hours"
+    leads = lead_extractor._heuristic_extract(text, "google_maps")
+    assert [(lead.company_name, lead.phone) for lead in leads] == [("Best Plumbing", "+1 206 555 1234")]
+
+
+def test_email_with_leading_digits_after_phone_is_kept():
+    text = "ĐT: 0909 123 456 - 0909123456@gmail.com"
+    leads = lead_extractor._heuristic_extract(text, "google_maps")
+    assert [lead.email for lead in leads] == ["0909123456@gmail.com"]
+
+
+def test_rendered_text_skips_html_stripping(monkeypatch):
+    def fail(html):
+        raise AssertionError("rendered text should not be stripped as HTML")
+
+    monkeypatch.setattr(lead_extractor, "_html_to_text", fail)
+    text = "Best Plumbing Co\nEmail: hello@bestplumbing.com Phone: +1 206 555 1234"
+    art = ScrapeArtifact(source="google_maps", step_id="s1", status="ok", text=text)
+    leads, errors = lead_extractor.extract_leads([art])
+
+    assert not errors
+    assert [lead.email for lead in leads] == ["hello@bestplumbing.com"]
+
+
+def test_llm_skipped_when_structured_listings_suffice():
+    calls = []
+
+    def transport(url, headers, body):
+        calls.append(url)
+        return {"choices": []}
+
+    listings = [{"name": f"Shop {i}", "phone": f"+1 206 555 000{i}"} for i in range(3)]
+    art = ScrapeArtifact(source="google_maps", step_id="s1", status="ok", json_blob=listings)
+    leads, errors = lead_extractor.extract_leads(
+        [art], llm_settings=LLMSettings(), use_llm=True, llm_transport=transport
+    )
+
+    assert not errors
+    assert len(leads) == 3
+    assert calls == []
+
+
+def test_llm_extraction_batches_artifacts_into_one_request():
+    calls = []
+
+    def transport(url, headers, body):
+        docs = json.loads(json.loads(body)["messages"][1]["content"])
+        calls.append(len(docs))
+        content = {d["doc_id"]: [{"company_name": f"LLM {d['text'].split()[0]}"}] for d in docs}
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+
+    arts = [
+        ScrapeArtifact(source="google_maps", step_id=f"s{i}", status="ok", html=f"page{i} {PAGE_FILLER}", segment_key=f"seg{i}")
+        for i in range(5)
+    ]
+    leads, errors = lead_extractor.extract_leads(
+        arts, llm_settings=LLMSettings(llm_batch_size=4), use_llm=True, llm_transport=transport
+    )
+
+    assert not errors
+    assert sorted(calls) == [1, 4]
+    assert [(lead.company_name, lead.segment_key) for lead in leads] == [
+        (f"LLM page{i}", f"seg{i}") for i in range(5)
+    ]
+
+
+def test_identical_html_reuses_cached_extraction_with_fresh_leads():
+    html = "<p>Mirror Co - mirror@example.com</p>"
+    arts = [
+        ScrapeArtifact(source="google_maps", step_id="s1", status="ok", html=html, segment_key="a"),
+        ScrapeArtifact(source="google_maps", step_id="s2", status="ok", html=html, segment_key="b"),
+    ]
+    leads, _ = lead_extractor.extract_leads(arts)
+
+    assert [lead.email for lead in leads] == ["mirror@example.com", "mirror@example.com"]
+    assert [lead.segment_key for lead in leads] == ["a", "b"]
+    assert leads[0].lead_id != leads[1].lead_id
+
+
+def test_llm_leads_overlapping_heuristics_are_not_duplicated():
+    def transport(url, headers, body):
+        content = {
+            "0": [
+                {"company_name": "Same Co", "email": "same@example.com"},
+                {"company_name": "New Co", "email": "new@example.com"},
+            ]
+        }
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+
+    html = f"<p>Same Co - same@example.com</p><p>{PAGE_FILLER}</p>"
+    art = ScrapeArtifact(source="google_maps", step_id="s1", status="ok", html=html)
+    leads, _ = lead_extractor.extract_leads([art], llm_settings=LLMSettings(), use_llm=True, llm_transport=transport)
+
+    assert [lead.email for lead in leads] == ["same@example.com", "new@example.com"]
+
+
+def test_segment_metadata_comes_from_each_leads_own_artifact():
+    arts = [
+        ScrapeArtifact(source="google_maps", step_id="s1", status="ok", html="<p>A - a@example.com</p>"),
+        ScrapeArtifact(
+            source="google_maps",
+            step_id="s2",
+            status="ok",
+            html="<p>B - b@example.com</p>",
+            segment_key="seg2",
+            segment_level="seattle",
+        ),
+    ]
+    leads, _ = lead_extractor.extract_leads(arts)
+
+    assert [(lead.segment_key, lead.segment_level) for lead in leads] == [(None, None), ("seg2", "seattle")]
+
+
+def test_llm_not_called_for_structured_listings():
+    calls = []
+
+    def transport(url, headers, body):
+        calls.append(url)
+        return {"choices": []}
+
+    art = ScrapeArtifact(
+        source="google_maps", step_id="s1", status="ok", json_blob=[{"name": "Only Shop"}], html="<p>x</p>"
+    )
+    leads, errors = lead_extractor.extract_leads(
+        [art], llm_settings=LLMSettings(), use_llm=True, llm_transport=transport
+    )
+
+    assert not errors
+    assert [lead.company_name for lead in leads] == ["Only Shop"]
+    assert calls == []
+
+
+def test_llm_batch_accepts_flat_lead_list_tagged_by_doc_id():
+    def transport(url, headers, body):
+        content = {"leads": [{"doc_id": "1", "company_name": "Second"}, {"id": 0, "company_name": "First"}]}
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+
+    arts = [
+        ScrapeArtifact(source="google_maps", step_id=f"s{i}", status="ok", html=f"page{i} {PAGE_FILLER}", segment_key=f"seg{i}")
+        for i in range(2)
+    ]
+    leads, errors = lead_extractor.extract_leads(
+        arts, llm_settings=LLMSettings(llm_batch_size=0), use_llm=True, llm_transport=transport
+    )
+
+    assert not errors
+    assert [(lead.company_name, lead.segment_key) for lead in leads] == [("First", "seg0"), ("Second", "seg1")]
+
+
+def test_llm_skips_short_and_repeated_page_text():
+    calls = []
+
+    def transport(url, headers, body):
+        calls.append(json.loads(json.loads(body)["messages"][1]["content"]))
+        return {"choices": [{"message": {"content": "{}"}}]}
+
+    arts = [
+        ScrapeArtifact(source="google_maps", step_id="s1", status="ok", html="<p>tiny</p>"),
+        ScrapeArtifact(source="google_maps", step_id="s2", status="ok", html=f"<p>{PAGE_FILLER}</p>"),
+        ScrapeArtifact(source="google_maps", step_id="s3", status="ok", html=f"<div>{PAGE_FILLER}</div>"),
+    ]
+    lead_extractor.extract_leads(arts, llm_settings=LLMSettings(), use_llm=True, llm_transport=transport)
+
+    assert len(calls) == 1
+    assert len(calls[0]) == 1
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from realtimex_lead_search import lead_search_agent
+from realtimex_lead_search.lead_search import playwright_scraper
+from realtimex_lead_search.lead_search.models import SearchRequest
+
+
+def _request(**features):
+    return SearchRequest.from_payload({"keywords": ["phone repair"], "locations": ["Hanoi"], "features": features})
+
+
+def test_execution_features_stay_out_of_the_fingerprint():
+    base = lead_search_agent._normalize_search_input(_request(anti_detection=True))
+    tuned = lead_search_agent._normalize_search_input(
+        _request(anti_detection=True, scrape_workers=4, extract_workers=4)
+    )
+
+    assert tuned == base
+    assert lead_search_agent._normalize_search_input(_request(anti_detection=False)) != base
+
+
+def test_main_hands_browser_factory_and_scrape_workers_to_the_scraper(tmp_path, monkeypatch, capsys):
+    payload = tmp_path / "payload.json"
+    payload.write_text(
+        json.dumps(
+            {
+                "keywords": ["phone repair"],
+                "locations": ["Hanoi"],
+                "features": {"scrape_workers": 3},
+                "storage": {"sqlite_path": None},
+            }
+        )
+    )
+    seen = {}
+
+    def fake_scrape_steps(steps, **kwargs):
+        seen.update(kwargs)
+        return []
+
+    monkeypatch.setattr(playwright_scraper, "scrape_steps", fake_scrape_steps)
+    factory = object
+    lead_search_agent.main(["--payload", str(payload)], browser_factory=factory)
+
+    assert seen["browser_factory"] is factory
+    assert seen["max_parallel"] == 3
+    assert json.loads(capsys.readouterr().out)["leads"] == []
+
+
+@pytest.mark.parametrize("codec", ["orjson", "stdlib"])
+def test_response_json_round_trips_non_ascii(codec, monkeypatch, capsysbinary):
+    if codec == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(lead_search_agent, "orjson", None)
+    data = {
+        "leads": [{"company_name": "Tiệm Sửa Điện Thoại Hà Nội", "score": 0.7, "email": None}],
+        "logs": ["event=payload.loaded", "Café Zürich — 東京"],
+        "cache": {"hits": 0, "kept": 1},
+    }
+
+    lead_search_agent._write_json(data)
+    out = capsysbinary.readouterr().out
+
+    assert "Tiệm Sửa Điện Thoại Hà Nội".encode("utf-8") in out
+    assert lead_search_agent._loads(out) == data
@@ -0,0 +1,119 @@
+import json
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from realtimex_lead_search.lead_search import llm_adapter
+
+_PROXY_VARS = ("http_proxy", "https_proxy", "all_proxy", "no_proxy")
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/moved"):
+            self._reply(302, b"", location="/v1/chat/completions")
+        elif self.path.endswith("/fail"):
+            self._reply(500, b'{"error": "boom"}')
+        else:
+            self._reply(200, json.dumps({"path": self.path, "port": self.client_address[1]}).encode())
+        if self.server.drop_next:
+            # Close without "Connection: close" so the client still believes the socket is alive.
+            self.server.drop_next = False
+            self.close_connection = True
+
+    def do_GET(self):
+        self._reply(200, json.dumps({"path": self.path, "method": "GET"}).encode())
+
+    def _reply(self, status, body, location=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if location:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def no_proxy_env(monkeypatch):
+    for name in _PROXY_VARS:
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    httpd.daemon_threads = True
+    httpd.drop_next = False
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    httpd.base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    for key in list(getattr(llm_adapter._LOCAL, "conns", {})):
+        llm_adapter._drop_connection(key)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _post(url):
+    return llm_adapter._default_transport(url, {"Content-Type": "application/json"}, b"{}")
+
+
+def test_default_transport_reuses_keep_alive_connection(server):
+    first = _post(f"{server.base_url}/v1/chat/completions")
+    second = _post(f"{server.base_url}/v1/chat/completions?x=1")
+
+    assert second["path"] == "/v1/chat/completions?x=1"
+    assert first["port"] == second["port"]
+
+
+def test_default_transport_retries_once_on_stale_socket(server, monkeypatch):
+    dropped = []
+    drop_connection = llm_adapter._drop_connection
+    monkeypatch.setattr(llm_adapter, "_drop_connection", lambda key: (dropped.append(key), drop_connection(key)))
+    server.drop_next = True
+    first = _post(f"{server.base_url}/v1/chat/completions")
+    second = _post(f"{server.base_url}/v1/chat/completions")
+
+    assert second["path"] == "/v1/chat/completions"
+    assert first["port"] != second["port"]
+    assert len(dropped) == 1  # the stale socket, discovered on the second request
+
+
+def test_default_transport_raises_http_error_and_recovers(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _post(f"{server.base_url}/fail")
+    assert excinfo.value.code == 500
+    assert json.loads(excinfo.value.read()) == {"error": "boom"}
+
+    assert _post(f"{server.base_url}/v1/chat/completions")["path"] == "/v1/chat/completions"
+
+
+def test_default_transport_follows_redirects(server):
+    result = _post(f"{server.base_url}/moved")
+
+    assert result == {"path": "/v1/chat/completions", "method": "GET"}
+
+
+def test_default_transport_sends_through_environment_proxy(server, monkeypatch):
+    monkeypatch.setenv("http_proxy", server.base_url)
+
+    result = _post("http://llm.example.invalid/v1/chat/completions")
+
+    assert result["path"] == "http://llm.example.invalid/v1/chat/completions"
+
+
+def test_default_transport_honours_no_proxy(server, monkeypatch):
+    monkeypatch.setenv("http_proxy", "http://127.0.0.1:9")
+    monkeypatch.setenv("no_proxy", "127.0.0.1")
+
+    assert _post(f"{server.base_url}/v1/chat/completions")["path"] == "/v1/chat/completions"
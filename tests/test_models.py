@@ -0,0 +1,43 @@
+from dataclasses import asdict
+from types import SimpleNamespace
+
+from realtimex_lead_search.lead_search import models
+from realtimex_lead_search.lead_search.models import (
+    CacheStats,
+    LeadCandidate,
+    LeadSearchResponse,
+    RunMetadata,
+    ScoredLead,
+)
+
+
+def test_to_dict_matches_asdict_for_nested_dataclasses():
+    response = LeadSearchResponse(
+        metadata=RunMetadata(errors=["timeout"], stats={"artifacts": 2, "nested": {"ok": [1, 2]}}),
+        leads=[
+            ScoredLead(lead=LeadCandidate(company_name="Full Co", email="a@full.example", phone="+1 555"), score=0.9),
+            ScoredLead(lead=LeadCandidate(company_name="Bare Co"), score=0.1, rationale="no contact"),
+        ],
+        persistence=None,
+        cache=CacheStats(hits=1, kept=2),
+        logs=["event=one", "event=two"],
+        passthrough={"tags": ("a", "b"), "extra": None},
+    )
+
+    assert response.to_dict() == asdict(response)
+    assert response.to_dict()["leads"][1]["lead"]["email"] is None
+
+
+def test_ts_cached_reuses_stamp_within_ttl(monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(models, "time", SimpleNamespace(time=lambda: clock[0]))
+    monkeypatch.setattr(models, "_TS_CACHE", (0.0, ""))
+
+    first = models._ts_cached()
+    clock[0] += models._TS_TTL / 2
+    assert models._ts_cached() == first
+
+    clock[0] += models._TS_TTL
+    refreshed = models._ts_cached()
+    assert refreshed != first
+    assert refreshed == models.datetime.fromtimestamp(clock[0], models.timezone.utc).isoformat()
@@ -1,8 +1,27 @@
-from realtimex_lead_search.lead_search import playwright_scraper
+import threading
+
+import pytest
+
+from realtimex_lead_search.lead_search import lead_extractor, playwright_scraper
 from realtimex_lead_search.lead_search.models import StrategyStep
 
 
+_HEADING_SELECTORS = frozenset({"[role='heading']", "h1", "h2", "h3", "div.fontHeadlineSmall", "span.DkEaL"})
+_WEBSITE_SELECTORS = frozenset({"a[data-value='Website']", "a[aria-label='Website']", "a:has-text('Website')"})
+_HREF_SELECTORS = frozenset({"a[href*='/maps/place/']", "a"})
+
+
+@pytest.fixture(autouse=True)
+def clear_listings_cache():
+    # Fake pages share body text across tests; keep parsed listings per test.
+    playwright_scraper._LISTINGS_CACHE.clear()
+    yield
+    playwright_scraper._LISTINGS_CACHE.clear()
+
+
 class FakeLink:
+    __slots__ = ("href",)
+
     def __init__(self, href):
         self.href = href
 
@@ -11,6 +30,8 @@ class FakeLink:
 
 
 class FakeEl:
+    __slots__ = ("_text",)
+
     def __init__(self, text):
         self._text = text
 
@@ -19,31 +40,38 @@ class FakeEl:
 
 
 class FakeCard:
+    __slots__ = ("_text", "_nodes")
+
     def __init__(self, name, text, href=None, website=None):
-        self._name = name
         self._text = text
-        self._href = href
-        self._website = website
+        # (selectors the node matches, node), in document order.
+        self._nodes = [(_HEADING_SELECTORS, FakeEl(name))]
+        if website:
+            self._nodes.append((_WEBSITE_SELECTORS, FakeLink(website)))
+        if href:
+            self._nodes.append((_HREF_SELECTORS, FakeLink(href)))
 
     def inner_text(self):
         return self._text
 
     def query_selector(self, selector):
-        if selector in ["[role='heading']", "h1", "h2", "h3", "div.fontHeadlineSmall", "span.DkEaL"]:
-            return FakeEl(self._name)
-        if selector in ["a[data-value='Website']", "a[aria-label='Website']", "a:has-text('Website')"] and self._website:
-            return FakeLink(self._website)
-        if selector in ["a[href*='/maps/place/']", "a"] and self._href:
-            return FakeLink(self._href)
+        # Like the DOM, a selector list ("a, b") returns the first node in document order.
+        wanted = set(selector.split(", "))
+        for selectors, node in self._nodes:
+            if selectors & wanted:
+                return node
         return None
 
 
 class FakePage:
+    __slots__ = ("cards", "_html", "last_url", "screenshot_path", "screenshot_kwargs")
+
     def __init__(self, cards, html="body"):
         self.cards = cards
         self._html = html
         self.last_url = None
         self.screenshot_path = None
+        self.screenshot_kwargs = None
 
     def goto(self, url, timeout=None):
         self.last_url = url
@@ -63,11 +91,15 @@ class FakePage:
     def query_selector_all(self, selector):
         return self.cards
 
-    def screenshot(self, path=None, full_page=None):
+    def screenshot(self, path=None, full_page=None, **kwargs):
         self.screenshot_path = path
+        self.screenshot_kwargs = dict(kwargs, full_page=full_page)
+        return b"jpeg-bytes"
 
 
 class FakeContext:
+    __slots__ = ("page", "headers", "viewport")
+
     def __init__(self, page):
         self.page = page
         self.headers = None
@@ -84,6 +116,8 @@ class FakeContext:
 
 
 class FakeBrowser:
+    __slots__ = ("page",)
+
     def __init__(self, page):
         self.page = page
 
@@ -94,22 +128,33 @@ class FakeBrowser:
         return None
 
 
+# Read-only inputs shared across tests; pages are rebuilt per test since they record calls.
+_STEPS = (StrategyStep(source="google_maps", query="q"),)
+_SHOP_CARDS = (FakeCard("Shop", "Shop\n+1 555-111-2222"),)
+
+
+def _single_browser(page):
+    """Browser factory that hands out one pre-built browser however often it is called."""
+    browser = FakeBrowser(page)
+    return lambda: browser
+
+
+_REAL_SHOP_CARDS = (
+    FakeCard("Sponsored", "Sponsored listing", href="https://maps.example/sponsored"),
+    FakeCard(
+        "Real Shop",
+        "Real Shop\n4.9(10)\nCategory: Mobile Repair\nAddress: 123 Main St\nCall +1 555-111-2222",
+        href="https://maps.example/real",
+        website="https://realshop.example.com",
+    ),
+)
+
+
 def test_scrape_filters_sponsored_and_parses_phone():
-    cards = [
-        FakeCard("Sponsored", "Sponsored listing", href="https://maps.example/sponsored"),
-        FakeCard(
-            "Real Shop",
-            "Real Shop\n4.9(10)\nCategory: Mobile Repair\nAddress: 123 Main St\nCall +1 555-111-2222",
-            href="https://maps.example/real",
-            website="https://realshop.example.com",
-        ),
-    ]
-    page = FakePage(cards, html="<html>body</html>")
-    browser_factory = lambda: FakeBrowser(page)
-    steps = [StrategyStep(source="google_maps", query="q")]
+    page = FakePage(_REAL_SHOP_CARDS, html="<html>body</html>")
 
     artifacts = playwright_scraper.scrape_steps(
-        steps, anti_detection_config={"enabled": True}, browser_factory=browser_factory
+        _STEPS, anti_detection_config={"enabled": True}, browser_factory=_single_browser(page)
     )
 
     assert len(artifacts) == 1
@@ -123,20 +168,365 @@ def test_scrape_filters_sponsored_and_parses_phone():
     assert entry["address"] == "123 Main St"
     assert entry["category"] == "Mobile Repair"
     assert "screenshot" not in (art.screenshot_path or "")
+    assert art.text == "<html>body</html>"
+    assert art.html is None
 
 
 def test_scrape_captcha_detection_marks_error():
     page = FakePage(cards=[], html="Please solve the captcha to continue")
-    browser_factory = lambda: FakeBrowser(page)
-    steps = [StrategyStep(source="google_maps", query="q")]
 
     artifacts = playwright_scraper.scrape_steps(
-        steps,
+        _STEPS,
         anti_detection_config={"enabled": True, "max_retries": 1},
-        browser_factory=browser_factory,
+        browser_factory=_single_browser(page),
     )
 
     assert len(artifacts) == 1
     art = artifacts[0]
     assert art.status == "error"
     assert "captcha" in (art.error or "").lower()
+
+
+def test_scrape_screenshot_is_viewport_jpeg(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    page = FakePage(_SHOP_CARDS, html="<html>body</html>")
+
+    artifacts = playwright_scraper.scrape_steps(
+        _STEPS,
+        anti_detection_config={"enabled": True},
+        capture_screenshots=True,
+        browser_factory=_single_browser(page),
+    )
+
+    assert artifacts[0].screenshot_path.endswith(".jpg")
+    assert (tmp_path / artifacts[0].screenshot_path).read_bytes() == b"jpeg-bytes"
+    assert page.screenshot_kwargs == {"type": "jpeg", "quality": 60, "full_page": False}
+
+
+def test_browser_pool_reuses_and_recycles_browsers():
+    launched = []
+
+    def factory():
+        browser = FakeBrowser(FakePage(_SHOP_CARDS))
+        launched.append(browser)
+        return browser
+
+    steps = [StrategyStep(source="google_maps", query=f"q{i}") for i in range(5)]
+    with playwright_scraper.BrowserPool(factory, {"enabled": True}, max_uses_per_instance=2) as pool:
+        artifacts = playwright_scraper.scrape_steps(
+            steps, anti_detection_config={"enabled": True}, browser_pool=pool
+        )
+
+    assert [art.status for art in artifacts] == ["ok"] * 5
+    assert len(launched) == 3
+
+
+def test_parallel_scrape_keeps_step_order_with_preloaded_steps():
+    steps = [StrategyStep(source="google_maps", query=f"q{i}") for i in range(4)]
+
+    def factory():
+        page = FakePage(_SHOP_CARDS, html="<html>body</html>")
+        return FakeBrowser(page)
+
+    artifacts = playwright_scraper.scrape_steps(
+        steps,
+        anti_detection_config={"enabled": True},
+        browser_factory=factory,
+        preloaded_html={"q1": "<p>cached</p>"},
+        max_parallel=3,
+    )
+
+    assert [art.step_id for art in artifacts] == [step.step_id for step in steps]
+    assert artifacts[1].html == "<p>cached</p>"
+    assert all(art.status == "ok" for art in artifacts)
+
+
+class NoImagePage(FakePage):
+    __slots__ = ()
+
+    def screenshot(self, path=None, full_page=None, **kwargs):
+        return None
+
+
+def test_screenshot_path_only_set_when_image_captured(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    page = NoImagePage(_SHOP_CARDS, html="<html>body</html>")
+
+    artifacts = playwright_scraper.scrape_steps(
+        _STEPS, anti_detection_config={"enabled": True}, capture_screenshots=True, browser_factory=_single_browser(page)
+    )
+
+    assert artifacts[0].status == "ok"
+    assert artifacts[0].screenshot_path is None
+
+
+def test_failed_screenshot_write_clears_path_and_records_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    page = FakePage(_SHOP_CARDS, html="<html>body</html>")
+    steps = [StrategyStep(source="google_maps", query="q", step_id="no-such-dir/q")]
+
+    artifacts = playwright_scraper.scrape_steps(
+        steps, anti_detection_config={"enabled": True}, capture_screenshots=True, browser_factory=_single_browser(page)
+    )
+
+    assert artifacts[0].status == "ok"
+    assert artifacts[0].screenshot_path is None
+    assert artifacts[0].error.startswith("screenshot write failed:")
+    assert playwright_scraper._PENDING_SCREENSHOTS == {}
+
+
+class FakeEvaluatePage(FakePage):
+    __slots__ = ("raw_cards", "evaluate_calls")
+
+    def __init__(self, raw_cards, html="body"):
+        super().__init__(cards=[], html=html)
+        self.raw_cards = raw_cards
+        self.evaluate_calls = 0
+
+    def evaluate(self, script, arg=None):
+        self.evaluate_calls += 1
+        return self.raw_cards[: arg["maxItems"]]
+
+    def query_selector_all(self, selector):
+        raise AssertionError("evaluate path should not walk the DOM per card")
+
+
+def test_listings_extracted_with_single_evaluate_round_trip():
+    page = FakeEvaluatePage(
+        [
+            {"text": "Sponsored listing", "name": "Sponsored", "website": None, "map_url": None},
+            {
+                "text": "Real Shop\nCategory: Mobile Repair\nAddress: 123 Main St\nCall +1 555-111-2222",
+                "name": "Real Shop ",
+                "website": "https://realshop.example.com",
+                "map_url": "https://maps.example/real",
+            },
+        ]
+    )
+
+    listings = playwright_scraper._extract_listings(page)
+
+    assert page.evaluate_calls == 1
+    assert [entry["name"] for entry in listings] == ["Real Shop"]
+    assert listings[0]["phone"] == "+1 555-111-2222"
+    assert listings[0]["url"] == "https://maps.example/real"
+
+
+def test_identical_page_reuses_parsed_listings():
+    page = FakeEvaluatePage(
+        [{"text": "Shop\n+1 555-111-2222", "name": "Shop", "website": None, "map_url": None}],
+        html="Shop +1 555-111-2222",
+    )
+    steps = [StrategyStep(source="google_maps", query="q", step_id=f"s{i}") for i in range(2)]
+
+    artifacts = playwright_scraper.scrape_steps(
+        steps, anti_detection_config={"enabled": True}, browser_factory=_single_browser(page)
+    )
+
+    assert page.evaluate_calls == 1
+    assert artifacts[0].json_blob == artifacts[1].json_blob
+    assert artifacts[0].json_blob[0] is not artifacts[1].json_blob[0]
+
+
+_MAPS_CARDS_HTML = """
+<div role="article">
+  <div role="heading">Real Shop</div>
+  <div>Category: Mobile Repair</div>
+  <div>Address: 123 Main St</div>
+  <div>Call +1 555-111-2222 or mail shop@realshop.example.com</div>
+  <a href="https://maps.example/maps/place/real">Directions</a>
+  <a href="https://realshop.example.com">Website</a>
+</div>
+<div role="article"><div role="heading">Sponsored</div></div>
+"""
+
+
+def test_maps_html_is_parsed_into_listings():
+    pytest.importorskip("selectolax")
+
+    assert playwright_scraper._extract_listings_from_html(_MAPS_CARDS_HTML) == [
+        {
+            "name": "Real Shop",
+            "phone": "+1 555-111-2222",
+            "address": "123 Main St",
+            "category": "Mobile Repair",
+            "map_url": "https://maps.example/maps/place/real",
+            "website": "https://realshop.example.com",
+            "url": "https://maps.example/maps/place/real",
+        }
+    ]
+    with_text = playwright_scraper._extract_listings_from_html(_MAPS_CARDS_HTML, include_raw_text=True)
+    assert with_text[0]["raw_text"] == (
+        "Real Shop\nCategory: Mobile Repair\nAddress: 123 Main St\n"
+        "Call +1 555-111-2222 or mail shop@realshop.example.com\nDirections\nWebsite"
+    )
+
+
+def test_card_collectors_share_selector_priority():
+    pytest.importorskip("selectolax")
+    # The subtitle comes first in the document, but [role='heading'] outranks h3.
+    card = FakeCard("unused", "Name\nSubtitle")
+    card._nodes = [({"h3"}, FakeEl("Subtitle")), ({"[role='heading']"}, FakeEl("Name"))]
+    html = '<div role="article"><h3>Subtitle</h3><div role="heading">Name</div></div>'
+
+    dom = playwright_scraper._collect_cards_dom(FakePage([card]), 5)
+    parsed = playwright_scraper._collect_cards_html(html, 5)
+
+    assert dom[0]["name"] == parsed[0]["name"] == "Name"
+
+
+@pytest.mark.parametrize("with_selectolax", [True, False], ids=["selectolax", "no-selectolax"])
+def test_preloaded_html_leads_do_not_depend_on_html_parser(monkeypatch, with_selectolax):
+    if with_selectolax:
+        pytest.importorskip("selectolax")
+    else:
+        monkeypatch.setattr(playwright_scraper, "_LexborHTMLParser", None)
+
+    artifacts = playwright_scraper.scrape_steps(_STEPS, preloaded_html={"q": _MAPS_CARDS_HTML})
+    leads, errors = lead_extractor.extract_leads(artifacts)
+
+    assert artifacts[0].html == _MAPS_CARDS_HTML
+    assert artifacts[0].json_blob is None
+    assert not errors
+    assert [(lead.email, lead.phone) for lead in leads] == [
+        ("shop@realshop.example.com", "+1 555-111-2222 ")
+    ]
+
+
+class TextOnlyPage(FakePage):
+    __slots__ = ()
+
+    def content(self):
+        raise AssertionError("page.content() should not be fetched when inner_text succeeds")
+
+
+def test_scrape_skips_page_content_when_inner_text_succeeds():
+    page = TextOnlyPage(_SHOP_CARDS, html="Shop +1 555-111-2222")
+
+    artifacts = playwright_scraper.scrape_steps(
+        _STEPS, anti_detection_config={"enabled": True, "max_retries": 1}, browser_factory=_single_browser(page)
+    )
+
+    assert artifacts[0].status == "ok"
+    assert artifacts[0].text == "Shop +1 555-111-2222"
+    assert artifacts[0].html is None
+
+
+class CountingBrowser(FakeBrowser):
+    __slots__ = ("contexts",)
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.contexts = 0
+
+    def new_context(self, *args, **kwargs):
+        self.contexts += 1
+        return super().new_context(*args, **kwargs)
+
+
+def test_browser_and_context_created_lazily_once():
+    launched = []
+
+    def factory():
+        browser = CountingBrowser(FakePage(_SHOP_CARDS))
+        launched.append(browser)
+        return browser
+
+    steps = [StrategyStep(source="google_maps", query=f"q{i}") for i in range(3)]
+    preloaded = {step.query: "<p>cached</p>" for step in steps}
+    playwright_scraper.scrape_steps(steps, browser_factory=factory, preloaded_html=preloaded)
+    assert launched == []
+
+    playwright_scraper.scrape_steps(steps, anti_detection_config={"enabled": True}, browser_factory=factory)
+    assert len(launched) == 1
+    assert launched[0].contexts == 1
+
+
+class WaitRecordingPage(FakePage):
+    __slots__ = ("waits",)
+
+    def __init__(self, cards, html="body"):
+        super().__init__(cards, html=html)
+        self.waits = []
+
+    def wait_for_timeout(self, ms):
+        self.waits.append(ms)
+
+
+def test_throttle_delay_waits_on_the_page(monkeypatch):
+    page = WaitRecordingPage(_SHOP_CARDS, html="Shop +1 555-111-2222")
+
+    def no_sleep(seconds):
+        raise AssertionError("throttle should wait on the page, not time.sleep")
+
+    monkeypatch.setattr(playwright_scraper.time, "sleep", no_sleep)
+
+    playwright_scraper.scrape_steps(
+        _STEPS,
+        anti_detection_config={"enabled": True, "min_delay_ms": 250, "max_delay_ms": 250, "render_wait_ms": 0},
+        browser_factory=_single_browser(page),
+    )
+
+    assert page.waits == [250]
+
+
+class ThreadBoundBrowser(FakeBrowser):
+    """Mimics sync Playwright: every call must come from the thread that launched the browser."""
+
+    __slots__ = ("owner", "violations")
+
+    def __init__(self, page, violations):
+        super().__init__(page)
+        self.owner = threading.get_ident()
+        self.violations = violations
+
+    def _check(self, action):
+        if threading.get_ident() != self.owner:
+            self.violations.append(action)
+            raise RuntimeError("cannot switch to a different thread")
+
+    def new_context(self, *args, **kwargs):
+        self._check("new_context")
+        return super().new_context(*args, **kwargs)
+
+    def close(self):
+        self._check("close")
+
+
+class ThreadBoundPage(FakePage):
+    __slots__ = ("owner", "violations", "started")
+
+    def __init__(self, cards, violations, started):
+        super().__init__(cards, html="Shop +1 555-111-2222")
+        self.owner = threading.get_ident()
+        self.violations = violations
+        self.started = started
+
+    def goto(self, url, timeout=None):
+        if threading.get_ident() != self.owner:
+            self.violations.append("goto")
+            raise RuntimeError("cannot switch to a different thread")
+        if self.last_url is None:
+            self.started.wait(timeout=5)  # hold until every worker has launched its own browser
+        super().goto(url, timeout=timeout)
+
+
+def test_parallel_scrape_keeps_each_browser_on_its_own_thread():
+    violations = []
+    launched = []
+    started = threading.Barrier(3)
+
+    def factory():
+        browser = ThreadBoundBrowser(ThreadBoundPage(_SHOP_CARDS, violations, started), violations)
+        launched.append(browser)
+        return browser
+
+    steps = [StrategyStep(source="google_maps", query=f"q{i}") for i in range(9)]
+    artifacts = playwright_scraper.scrape_steps(
+        steps, anti_detection_config={"enabled": True}, browser_factory=factory, max_parallel=3
+    )
+
+    assert [art.status for art in artifacts] == ["ok"] * 9
+    assert [art.step_id for art in artifacts] == [step.step_id for step in steps]
+    assert violations == []
+    assert len({browser.owner for browser in launched}) == len(launched) == 3
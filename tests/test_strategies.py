@@ -1,3 +1,5 @@
+import itertools
+
 import pytest
 
 from realtimex_lead_search.lead_search.models import SearchRequest
@@ -13,8 +15,24 @@ def test_google_maps_strategy_builds_pages_per_keyword_location():
     }
     req = SearchRequest.from_payload(payload)
     steps = search_strategies.build_strategies(req)
-    # 2 keywords * 2 locations * 2 pages = 8
-    assert len(steps) == 8
+    combos = list(
+        itertools.product(payload["keywords"], payload["locations"], range(1, payload["pages_per_source"] + 1))
+    )
+    assert len(steps) == len(combos)
     assert all(step.source == "google_maps" for step in steps)
-    assert steps[0].page == 1
-    assert steps[1].page == 2
+    # StrategyStep carries the combined "keyword location" query rather than the keyword itself.
+    assert [(step.query, step.location, step.page) for step in steps] == [
+        (f"{kw} {loc}", loc, page) for kw, loc, page in combos
+    ]
+
+
+def test_google_maps_strategy_reuses_steps_for_identical_requests():
+    payload = {"keywords": ["plumber"], "locations": ["seattle"], "pages_per_source": 2}
+    first = search_strategies.build_google_maps_strategies(SearchRequest.from_payload(payload))
+    second = search_strategies.build_google_maps_strategies(SearchRequest.from_payload(payload))
+
+    assert first == second
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+    with pytest.raises(AttributeError):
+        first[0].page = 3